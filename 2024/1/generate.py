@@ -0,0 +1,36 @@
+"""Advent of Code 2024 - Day 1
+
+Author: Alexander Bessman
+
+Generate location lists of any length. Some numbers in the right list are copied from
+the left list, so that the similarity score is not trivially zero.
+"""
+
+import random
+
+
+SIZE = 1000
+
+
+def generate(size: int, seed: int = 0, overlap: float = 0.5) -> bytes:
+    """Generate two lists of five-digit location IDs.
+
+    Parameters
+    ----------
+    size : int
+        Number of lines.
+    seed : int
+    overlap : float
+        Probability that a number in the right list is taken from the left list.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    left = [rng.randrange(10000, 100000) for _ in range(size)]
+    right = [
+        rng.choice(left) if rng.random() < overlap else rng.randrange(10000, 100000)
+        for _ in range(size)
+    ]
+    return "".join(f"{a}   {b}\n" for a, b in zip(left, right)).encode()
@@ -3,11 +3,74 @@
 Author: Alexander Bessman
 """
 
-with open("input.txt") as f:
-    locations = [int(x) for xx in f for x in xx.split()]
+import mmap
+from typing import Iterator
 
-left = sorted(locations[::2])
-right = sorted(locations[1::2])
+import numpy as np
+import numpy.typing as npt
 
-print("1:", sum(abs(a - b) for a, b in zip(left, right)))
-print("2:", sum(a * right.count(a) for a in left))
+
+def read_columns(buffer: bytes) -> npt.NDArray[np.int64]:
+    """Parse lines of two whitespace-separated integers into an (n, 2) array.
+
+    If every line has its digits in the same positions, which is the case for the
+    puzzle input, the text is treated as a fixed-width table and each column is
+    converted in one vectorized step. Otherwise, falls back to np.fromstring.
+    """
+    buffer = buffer.rstrip(b"\n") + b"\n"
+    stride = buffer.index(b"\n") + 1
+
+    if len(buffer) % stride == 0:
+        lines = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, stride)
+        digits = (lines[0] >= ord("0")) & (lines[0] <= ord("9"))
+        valid = (lines[:, ~digits] == lines[0, ~digits]).all()
+        # Start and stop positions of each column of digits.
+        edges = np.flatnonzero(np.diff(digits, prepend=0, append=0)).reshape(-1, 2)
+        columns = [np.zeros(len(lines), dtype=np.int64) for _ in edges]
+
+        for column, (start, stop) in zip(columns, edges):
+            for i in range(start, stop):
+                digit = lines[:, i] - ord("0")
+                valid = valid and (digit <= 9).all()
+                column *= 10
+                column += digit
+
+        if valid:
+            return np.stack(columns, axis=1)
+
+    return np.fromstring(buffer, dtype=np.int64, sep=" ").reshape(-1, 2)
+
+
+def similarity(left: npt.NDArray[np.int64], right: npt.NDArray[np.int64]) -> int:
+    """Sum each number in 'left' multiplied by how many times it appears in 'right'.
+
+    'right' must be sorted.
+    """
+    starts = np.flatnonzero(np.diff(right, prepend=right[:1] - 1))
+    values = right[starts]
+    counts = np.diff(starts, append=len(right))
+    i = np.searchsorted(values, left).clip(max=len(values) - 1)
+    return int((left * counts[i] * (values[i] == left)).sum())
+
+
+def parse(
+    buffer: bytes | mmap.mmap,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Return the left and right lists."""
+    left, right = read_columns(bytes(buffer)).T.copy()
+    return left, right
+
+
+def solve(lists: tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]) -> Iterator[int]:
+    """Yield the total distance and the similarity score between the lists."""
+    left, right = np.sort(lists[0]), np.sort(lists[1])
+    yield int(np.abs(left - right).sum())
+    yield similarity(left, right)
+
+
+if __name__ == "__main__":
+    with open("input.txt", "rb") as f:
+        lists = parse(f.read())
+
+    for part, answer in enumerate(solve(lists), 1):
+        print(f"{part}:", answer)
@@ -0,0 +1,50 @@
+"""Advent of Code 2024 - Day 10
+
+Author: Alexander Bessman
+
+Generate topographic maps of any size. The terrain is a repeating pattern of hills, so
+that there are plenty of hiking trails, with some random noise on top.
+"""
+
+import math
+import random
+
+
+SIZE = 50 * 50
+
+
+def generate(size: int, seed: int = 0, noise: float = 0.15, hill: int = 9) -> bytes:
+    """Generate a square topographic map.
+
+    Parameters
+    ----------
+    size : int
+        Number of locations. The side of the square is rounded to the nearest
+        integer.
+    seed : int
+    noise : float
+        Probability of each location having a random height.
+    hill : int
+        Distance from the foot to the top of each hill.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    side = max(1, round(math.sqrt(size)))
+    lines = []
+
+    for row in range(side):
+        heights = []
+
+        for col in range(side):
+            if rng.random() < noise:
+                heights.append(rng.randint(0, 9))
+            else:
+                distance = abs(row % (2 * hill) - hill) + abs(col % (2 * hill) - hill)
+                heights.append(min(9, distance))
+
+        lines.append("".join(map(str, heights)))
+
+    return ("\n".join(lines) + "\n").encode()
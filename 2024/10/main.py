@@ -1,90 +1,141 @@
 """Advent of Code - Day 10
 
 Author: Alexander Bessman
+
+Trails are counted rather than walked. Going down from the summits, each location
+inherits the summits and the number of trails of its neighbours one level higher. Each
+level is handled in one vectorized step over all locations at that level.
 """
 
+import mmap
 from typing import Iterator
 
+import numpy as np
+import numpy.typing as npt
+
+from aoc.grid import Grid, char_view, lookup, map_file
+
+
+DIGITS = {str(d): d for d in range(10)}
+
 
-class Topology:
-    def __init__(self, elevation: list[list[int]]) -> None:
-        self.elevation = elevation
+class Topology(Grid):
+    """Elevation map.
+
+    The map is stored as a flat int8 array, padded with a border of -1 so that every
+    location on the map has four neighbours at fixed offsets.
+    """
+
+    def __init__(self, elevation: npt.NDArray[np.integer]) -> None:
+        super().__init__(elevation.astype(np.int8), fill=-1)
 
     @property
-    def trailheads(self) -> Iterator[complex]:
-        for i, line in enumerate(self.elevation):
-            for j, location in enumerate(line):
-                if self[i + j * 1j] == 0:
-                    yield i + j * 1j
+    def elevation(self) -> npt.NDArray[np.int8]:
+        return self.cells
 
-    def __getitem__(self, key: complex) -> int:
-        x = int(key.real)
-        y = int(key.imag)
+    @property
+    def trailheads(self) -> npt.NDArray[np.integer]:
+        return np.concatenate(list(self.contour(0)))
 
-        if any(i < 0 for i in (x, y)):
-            return float("nan")
+    def contour(
+        self, level: int, block: int = 2**20
+    ) -> Iterator[npt.NDArray[np.integer]]:
+        """Yield flat indices of all locations at elevation 'level'.
 
-        try:
-            return self.elevation[x][y]
-        except IndexError:
-            return float("nan")
+        Indices are yielded a band of rows at a time, of about 'block' locations each,
+        and are int32 when the map is small enough for int32 flat indices.
+        """
+        index = np.int32 if self.elevation.size < 2**31 else np.int64
+        band = max(1, block // self.width) * self.width
+
+        for start in range(0, self.elevation.size, band):
+            found = np.flatnonzero(self.elevation[start : start + band] == level)
+            yield (found + start).astype(index)
 
     def __repr__(self) -> str:
-        return "\n".join("".join(str(p) for p in line) for line in self.elevation)
+        return "\n".join("".join(str(p) for p in line) for line in self.interior)
 
 
-def hike(location: complex, topology: Topology) -> list[list[complex]]:
-    """Return all trails which start from 'location'.
+def climb(topology: Topology, block: int = 2**20) -> tuple[int, int]:
+    """Score and rate all trailheads.
 
-    This is a recursive function.
+    The map is handled a band of rows at a time, so that apart from the map and one
+    count of trails per location, memory use stays bounded however large the map.
 
     Parameters
     ----------
-    location : complex
     topology : Topology
+    block : int
+        Approximate number of locations per band.
 
     Returns
     -------
-    list[list[complex]]
+    score : int
+        Total number of distinct summits reachable from each trailhead.
+    rating : int
+        Total number of distinct trails starting from each trailhead.
     """
-    up = -1
-    right = 1j
-    down = 1
-    left = -1j
-    trails = [[]]
-    elev = topology[location]
+    summit = 9
+    elevation = topology.elevation
 
-    # Add all trails which continue from this position.
-    for direction in (up, right, down, left):
-        adjacent = topology[location + direction]
-        if adjacent - elev == 1:
-            trails.extend(hike(location + direction, topology))
+    # A location can have at most 4 * 3**8 trails, which fits in uint16.
+    trails = np.zeros(elevation.size, dtype=np.uint16)
+    rating = 0
 
-    # Append the current position to all trails.
-    for trail in trails:
-        trail.append(location)
+    for location in topology.contour(summit, block):
+        trails[location] = 1
 
-    return trails
+    # Each level only depends on the level above it, which is complete by the time
+    # its bands are handled.
+    for level in range(summit - 1, -1, -1):
+        for location in topology.contour(level, block):
+            adjacent = topology.neighbours(location)
+            higher = elevation[adjacent] == level + 1
+            trails[location] = (trails[adjacent] * higher).sum(axis=1)
 
+            if level == 0:
+                rating += int(trails[location].sum(dtype=np.int64))
+
+    # Pairs with different summits are distinct, so each band of summits is followed
+    # down on its own, and the counts of pairs are added up.
+    score = sum(
+        _descend(topology, summits, summit)
+        for summits in topology.contour(summit, block)
+    )
+    return score, rating
+
+
+def _descend(topology: Topology, summits: npt.NDArray[np.integer], summit: int) -> int:
+    """Count the distinct pairs of trailheads and 'summits' joined by a trail."""
+    elevation = topology.elevation
+    # Pairs of locations and summits reachable from them, at the current level.
+    pairs = summits, summits
+
+    for level in range(summit - 1, -1, -1):
+        # Neighbours are symmetric, so stepping from each pair's location to all of
+        # its neighbours gives the lower locations which inherit its summit.
+        lower = topology.neighbours(pairs[0]).ravel()
+        keep = elevation[lower] == level
+        lower = lower[keep].astype(np.int64)
+        above = np.repeat(pairs[1], len(topology.offsets))[keep]
+        keys = np.sort(lower * elevation.size + above)
+        keys = keys[np.diff(keys, prepend=-1) != 0]  # Drop duplicate pairs.
+        pairs = tuple(p.astype(summits.dtype) for p in np.divmod(keys, elevation.size))
+
+    return len(pairs[0])
 
-def summit_climbs(topology: Topology) -> Iterator[list[complex]]:
-    summit = 9
-    for h in topology.trailheads:
-        trails = hike(h, topology)
-        yield from (t for t in trails if topology[t[0]] == summit)
 
+def parse(buffer: bytes | mmap.mmap) -> Topology:
+    return Topology(lookup(char_view(buffer), DIGITS, default=-1, dtype=np.int8))
 
-def unique_summit_climbs(topology: Topology) -> Iterator[list[complex]]:
-    climbs = set()
 
-    for t in summit_climbs(topology):
-        if (t[-1], t[0]) not in climbs:
-            yield t
-            climbs.add((t[-1], t[0]))
+def solve(topology: Topology) -> Iterator[int]:
+    """Yield the sum of the scores, then of the ratings, of all trailheads."""
+    yield from climb(topology)
 
 
-with open("input.txt") as f:
-    topology = Topology([[int(p) for p in list(line.strip())] for line in f])
+if __name__ == "__main__":
+    topology = parse(map_file("input.txt"))
 
-print("1:", len(list(unique_summit_climbs(topology))))
-print("2:", len(list(summit_climbs(topology))))
+    for part, answer in enumerate(solve(topology), 1):
+        print(f"{part}:", answer)
@@ -0,0 +1,31 @@
+"""Advent of Code 2024 - Day 11
+
+Author: Alexander Bessman
+
+Generate rows of any number of stones.
+"""
+
+import random
+
+
+SIZE = 8
+
+
+def generate(size: int, seed: int = 0, digits: int = 7) -> bytes:
+    """Generate a row of stones.
+
+    Parameters
+    ----------
+    size : int
+        Number of stones.
+    seed : int
+    digits : int
+        Largest number of digits engraved on a stone.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    stones = [rng.randrange(10 ** rng.randint(1, digits)) for _ in range(size)]
+    return (" ".join(map(str, stones)) + "\n").encode()
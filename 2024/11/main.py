@@ -1,14 +1,22 @@
 """Advent of Code 2024 - Day 11
 
 Author: Alexander Bessman
+
+Only a few thousand distinct stones can ever appear, no matter how many times you
+blink. These are found up front and numbered, after which each blink is a fixed
+mapping from one vector of stone counts to the next.
 """
 
+import mmap
+import sys
 from collections import Counter
-from functools import cache
 from math import log10
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
 
 
-@cache
 def blink(stone) -> tuple[int]:
     if stone == 0:
         return (1,)
@@ -21,20 +29,130 @@ def blink(stone) -> tuple[int]:
     return (stone * 2024,)
 
 
-def main(stones: Counter[int, int], blinks: int) -> int:
+class Transitions:
+    """Table of what every reachable stone turns into after one blink.
+
+    Parameters
+    ----------
+    stones : Iterable[int]
+        Initial stones. All stones these can turn into, after any number of blinks, are
+        added to the table.
+    """
+
+    def __init__(self, stones: Iterable[int]) -> None:
+        self.ids: dict[int, int] = {}
+        self.stones: list[int] = []
+        successors: list[tuple[int, ...]] = []
+
+        for stone in stones:
+            self.intern(stone)
+
+        # self.stones grows while it is being iterated over, until it is closed.
+        for stone in self.stones:
+            successors.append(tuple(self.intern(s) for s in blink(stone)))
+
+        # Flatten table into (source, destination) edges, grouped by destination, so
+        # that a blink is a single reduceat.
+        src = np.array([i for i, succ in enumerate(successors) for _ in succ])
+        dst = np.array([j for succ in successors for j in succ])
+        order = np.argsort(dst, kind="stable")
+        self.src = src[order]
+        self.dst, self.starts = np.unique(dst[order], return_index=True)
+        # Largest number of stones which turn into the same stone.
+        self.fan_in = int(np.diff(self.starts, append=len(src)).max(initial=0))
+
+    def intern(self, stone: int) -> int:
+        """Return the id of 'stone', adding it to the table if necessary."""
+        if stone not in self.ids:
+            self.ids[stone] = len(self.stones)
+            self.stones.append(stone)
+
+        return self.ids[stone]
+
+    def blink(self, counts: npt.NDArray) -> npt.NDArray:
+        """Blink once, given the number of stones of each id."""
+        new = np.zeros_like(counts)
+        new[self.dst] = np.add.reduceat(counts[self.src], self.starts)
+        return new
+
+    def __len__(self) -> int:
+        return len(self.stones)
+
+
+def main(
+    stones: Counter[int, int],
+    blinks: int,
+    transitions: Optional[Transitions] = None,
+    modulus: Optional[int] = None,
+) -> tuple[int, int]:
+    """Count the stones after blinking.
+
+    Parameters
+    ----------
+    stones : Counter[int, int]
+        Number of each initial stone.
+    blinks : int
+    transitions : Optional[Transitions]
+        Transition table which includes 'stones'. Built if not given.
+    modulus : Optional[int]
+        If given, counts are kept modulo this number. This keeps counts in int64
+        instead of arbitrary-precision ints, which matters when blinking tens of
+        thousands of times or more.
+
+    Returns
+    -------
+    total : int
+        Number of stones after blinking.
+    peak : int
+        Largest number of distinct stones seen after any blink.
+    """
+    transitions = transitions or Transitions(stones)
+
+    if modulus is not None and modulus * max(transitions.fan_in, 1) >= 2**63:
+        raise ValueError(f"modulus too large for {transitions.fan_in}-way fan-in")
+
+    counts = np.zeros(len(transitions), dtype=object if modulus is None else np.int64)
+
+    for s, n in stones.items():
+        counts[transitions.ids[s]] = n if modulus is None else n % modulus
+
+    peak = int(np.count_nonzero(counts))
+
     for i in range(blinks):
-        new = Counter()
+        counts = transitions.blink(counts)
+
+        if modulus is not None:
+            counts %= modulus
+
+        peak = max(peak, int(np.count_nonzero(counts)))
+
+    total = int(counts.sum(dtype=object))
+    return total if modulus is None else total % modulus, peak
+
+
+def parse(buffer: bytes | mmap.mmap) -> Counter[int, int]:
+    return Counter(map(int, bytes(buffer).split()))
+
 
-        for s, n in stones.items():
-            for stone in blink(s):
-                new[stone] += n
+def solve(stones: Counter[int, int]) -> Iterator[int]:
+    """Yield the number of stones after blinking 25 times, then 75 times."""
+    transitions = Transitions(stones)
+    yield main(stones, 25, transitions)[0]
+    yield main(stones, 75, transitions)[0]
 
-        stones = new
-    return stones
 
+if __name__ == "__main__":
+    with open("input.txt", "rb") as f:
+        stones = parse(f.read())
 
-with open("input.txt") as f:
-    stones = Counter(map(int, f.read().strip().split()))
+    transitions = Transitions(stones)
+    total1, peak1 = main(stones, 25, transitions)
+    total2, peak2 = main(stones, 75, transitions)
 
-print("1:", main(stones, 25).total())
-print("2:", main(stones, 75).total())
+    print("1:", total1)
+    print("2:", total2)
+    print(
+        f"Peak distinct stones: {peak1} (part 1), {peak2} (part 2), of "
+        f"{len(transitions)}",
+        file=sys.stderr,
+    )
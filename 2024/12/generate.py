@@ -0,0 +1,61 @@
+"""Advent of Code 2024 - Day 12
+
+Author: Alexander Bessman
+
+Generate gardens of any size. Plants are laid out in random rectangular patches, which
+partly cover each other, and then some plots are replaced at random, so that regions
+come in all shapes, with holes and islands.
+"""
+
+import math
+import random
+import string
+
+
+SIZE = 140 * 140
+
+
+def generate(
+    size: int,
+    seed: int = 0,
+    plants: int = 26,
+    patch: int = 8,
+    noise: float = 0.02,
+) -> bytes:
+    """Generate a square garden.
+
+    Parameters
+    ----------
+    size : int
+        Number of plots. The side of the square is rounded to the nearest integer.
+    seed : int
+    plants : int
+        Number of different kinds of plants, at most 26.
+    patch : int
+        Largest side of a patch of plants.
+    noise : float
+        Probability of each plot getting a random plant.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    side = max(1, round(math.sqrt(size)))
+    choices = string.ascii_uppercase[:plants]
+    garden = [[choices[0]] * side for _ in range(side)]
+
+    for _ in range(2 * side * side // patch**2 + 1):
+        row, col = rng.randrange(side), rng.randrange(side)
+        height, width = rng.randint(1, patch), rng.randint(1, patch)
+        plant = rng.choice(choices)
+
+        for r in range(row, min(row + height, side)):
+            garden[r][col : col + width] = [plant] * len(garden[r][col : col + width])
+
+    for row in garden:
+        for col in range(side):
+            if rng.random() < noise:
+                row[col] = rng.choice(choices)
+
+    return b"".join("".join(row).encode() + b"\n" for row in garden)
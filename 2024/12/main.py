@@ -2,56 +2,52 @@
 
 Author: Alexander Bessman
 
-Solved by walking around each distinct area and counting steps (perimeter) and
-turns (sides).
+Originally solved by walking around each distinct area and counting steps (perimeter)
+and turns (sides). Now all regions are labeled at once, and perimeters and sides are
+counted for every region simultaneously: each edge between two different labels is a
+step, and each corner of a region is a turn.
 """
 
+import argparse
+import mmap
 from dataclasses import dataclass
-from typing import Iterator
+from typing import Iterator, Literal
 
 import numpy as np
 import numpy.typing as npt
 from scipy import ndimage
 
-
-UP = -1j
-RIGHT = 1
-DOWN = 1j
-LEFT = -1
+from aoc.grid import ARROWS, RIGHT, TURN_LEFT, TURN_RIGHT, Grid, char_view, map_file
 
 
 @dataclass
 class Walker:
     """Previously employed as guard in prototype suit manufacturing lab."""
 
-    pos: complex
-    dir: complex
+    pos: int
+    dir: int
+    offsets: tuple[int, ...]
 
-    @property
-    def row(self) -> int:
-        return int(self.pos.imag)
+    def step(self) -> None:
+        self.pos += self.offsets[self.dir]
 
-    @property
-    def col(self) -> int:
-        return int(self.pos.real)
+    def turn_right(self) -> None:
+        self.dir = TURN_RIGHT[self.dir]
 
-    def step(self) -> None:
-        self.pos += self.dir
+    def turn_left(self) -> None:
+        self.dir = TURN_LEFT[self.dir]
 
-    def lookahead(self) -> tuple[int, int]:
-        pos = self.pos + self.dir
-        return int(pos.imag), int(pos.real)
+    def lookahead(self) -> int:
+        return self.pos + self.offsets[self.dir]
 
-    def lookright(self) -> tuple[int, int]:
-        pos = self.pos + self.dir * 1j
-        return int(pos.imag), int(pos.real)
+    def lookright(self) -> int:
+        return self.pos + self.offsets[TURN_RIGHT[self.dir]]
 
     def __repr__(self) -> str:
-        arrow = {RIGHT: ">", DOWN: "v", LEFT: "<", UP: "^"}[self.dir]
-        return f"{self.row, self.col} {arrow}"
+        return f"{self.pos} {ARROWS[self.dir]}"
 
 
-def bw_perim_vertic(bw: npt.NDArray) -> tuple[int, int]:
+def bw_perim_vertic(bw: npt.NDArray, crop: bool = False) -> tuple[int, int]:
     """Count perimeter and vertices of area of 1's in a 2D binary matrix.
 
     This is a recursive function, but recursion depth should not exceed 1 in normal
@@ -60,35 +56,39 @@ def bw_perim_vertic(bw: npt.NDArray) -> tuple[int, int]:
     Parameters
     ----------
     bw : NDArray
+    crop : bool
+        If True, holes are cropped to their bounding boxes before recursing.
 
     Returns
     -------
     perimeter, num_vertices : tuple[int, int]
     """
     # Vertices are found by walking one lap around the shape and counting turns.
-    origin = complex(*min(zip(*bw.nonzero()))[::-1]) + 1  # One above topleftmost 1.
-    walker = Walker(origin, RIGHT)
+    row, col = min(zip(*bw.nonzero()))
+    frame = Grid(bw.astype(bool))
+    origin = frame.index(row - 1, col)  # One above topleftmost 1.
+    walker = Walker(origin, RIGHT, frame.offsets)
     walker.step()
-    frame = np.pad(bw, 1)
+    cells = frame.cells.tobytes()  # Indexing bytes is faster than indexing arrays.
     steps = 1
     turns = 0
 
-    while not walker.pos == origin:
-        if not frame[*walker.lookright()]:
+    while walker.pos != origin:
+        if not cells[walker.lookright()]:
             # Nothing on walker's righthand side, turn right.
-            walker.dir *= 1j
+            walker.turn_right()
             turns += 1
             steps -= 1  # Walker overstepped area, discard last stepcount.
 
-        elif frame[*walker.lookahead()]:
+        elif cells[walker.lookahead()]:
             # Something ahead, turn left.
-            walker.dir *= -1j
+            walker.turn_left()
             turns += 1
             steps += 1  # Walker is adjacent to two (or three) walls.
 
-            if frame[*walker.lookahead()]:
+            if cells[walker.lookahead()]:
                 # Something ahead again, we're in a dead end. Turn left again.
-                walker.dir *= -1j
+                walker.turn_left()
                 turns += 1
                 steps += 1
 
@@ -96,51 +96,172 @@ def bw_perim_vertic(bw: npt.NDArray) -> tuple[int, int]:
         steps += 1
 
     # Matrix may have holes, need to find perimeter/vertices of each hole.
-    regions, n = ndimage.label(1 - frame)
+    regions, n = ndimage.label(~frame.padded)
+    boxes = ndimage.find_objects(regions) if crop else [...] * n
 
     # 0 is current area of interest, 1 is background/padding, 2+ are holes.
     for hole in range(2, n + 1):
-        st = bw_perim_vertic(regions == hole)  # Recurse.
+        st = bw_perim_vertic(regions[boxes[hole - 1]] == hole, crop)  # Recurse.
         steps += st[0]
         turns += st[1]
 
     return steps, turns
 
 
-def garden_properties(garden: npt.NDArray) -> Iterator[tuple[int, int, int]]:
-    for k, plant in plants.items():
+def garden_properties(
+    garden: npt.NDArray,
+    crop: bool = False,
+) -> Iterator[tuple[int, int, int]]:
+    """Walk around each region of the garden.
+
+    Parameters
+    ----------
+    garden : NDArray
+    crop : bool
+        If True, each region is cropped to its bounding box before walking around it,
+        so that the cost of each region depends on its own size rather than on the
+        size of the garden.
+
+    Yields
+    ------
+    area, perimeter, sides : tuple[int, int, int]
+    """
+    for plant in np.unique(garden):
         regions, n = ndimage.label(garden == plant)
+        boxes = ndimage.find_objects(regions) if crop else [...] * n
 
         for region in range(1, n + 1):
-            bw = region == regions
+            bw = regions[boxes[region - 1]] == region
             area = bw.sum()
-            perimeter, sides = bw_perim_vertic(bw)
+            perimeter, sides = bw_perim_vertic(bw, crop)
             yield area, perimeter, sides
 
 
-def main(garden: npt.NDArray) -> tuple[int, int]:
+def label_regions(garden: npt.NDArray) -> tuple[npt.NDArray[np.intp], int]:
+    """Label every region of the garden with a distinct positive integer.
+
+    Parameters
+    ----------
+    garden : NDArray
+
+    Returns
+    -------
+    labels : NDArray[intp]
+        Same shape as 'garden'.
+    n : int
+        Number of regions.
+    """
+    labels = np.zeros(garden.shape, dtype=np.intp)
+    n = 0
+
+    for plant in np.unique(garden):
+        regions, m = ndimage.label(garden == plant)
+        np.add(labels, regions + n, out=labels, where=regions > 0)
+        n += m
+
+    return labels, n
+
+
+def region_properties(
+    garden: npt.NDArray,
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Measure area, perimeter, and number of sides of every region of the garden.
+
+    Parameters
+    ----------
+    garden : NDArray
+
+    Returns
+    -------
+    area, perimeter, sides : tuple[NDArray[intp], NDArray[intp], NDArray[intp]]
+        One element per region.
+    """
+    labels, n = label_regions(garden)
+    shifted = Grid(labels).shifted  # Outside is labeled 0.
+
+    def count(mask: npt.NDArray[np.bool_]) -> npt.NDArray[np.intp]:
+        return np.bincount(labels[mask], minlength=n + 1)
+
+    area = count(np.ones_like(labels, dtype=bool))
+    perimeter = sum(
+        count(shifted(drow, dcol) != labels)
+        for drow, dcol in ((-1, 0), (0, 1), (1, 0), (0, -1))
+    )
+    sides = 0
+
+    for drow, dcol in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+        # Each plot has a corner at each diagonal, which is either convex (neither
+        # adjacent plot in the region) or concave (both adjacent plots in the region,
+        # but not the diagonal one).
+        vertical = shifted(drow, 0) == labels
+        horizontal = shifted(0, dcol) == labels
+        diagonal = shifted(drow, dcol) == labels
+        convex = ~vertical & ~horizontal
+        concave = vertical & horizontal & ~diagonal
+        sides = sides + count(convex | concave)
+
+    return area[1:], perimeter[1:], sides[1:]
+
+
+def main(
+    garden: npt.NDArray,
+    strategy: Literal["label", "walk", "crop"] = "label",
+) -> tuple[int, int]:
+    """Calculate total fencing cost without and with bulk discount.
+
+    Parameters
+    ----------
+    garden : NDArray
+    strategy : Literal["label", "walk", "crop"]
+        "label" measures all regions at once using `region_properties`. "walk" walks
+        around each region using `garden_properties`, and "crop" does the same on
+        each region's bounding box only.
+
+    Returns
+    -------
+    cost1, cost2 : tuple[int, int]
+    """
+    if strategy == "label":
+        area, perimeter, sides = region_properties(garden)
+        cost1 = int(area @ perimeter)
+        cost2 = int(area @ sides)
+        return cost1, cost2
+
     cost1 = 0
     cost2 = 0
 
-    for area, perimeter, sides in garden_properties(garden):
+    for area, perimeter, sides in garden_properties(garden, crop=strategy == "crop"):
         cost1 += area * perimeter
         cost2 += area * sides
 
-    return cost1, cost2
+    return int(cost1), int(cost2)
+
+
+def parse(buffer: bytes | mmap.mmap) -> npt.NDArray[np.uint8]:
+    """Return the garden, with each plant as its character code."""
+    return char_view(buffer)
+
 
+def solve(
+    garden: npt.NDArray,
+    strategy: Literal["label", "walk", "crop"] = "label",
+) -> Iterator[int]:
+    """Yield the total fencing cost without and with bulk discount, see `main`."""
+    yield from main(garden, strategy)
 
-with open("input.txt") as f:
-    plants = {}
-    garden = []
 
-    for line in f:
-        for plant in list(line.strip()):
-            if plant not in plants:
-                plants[plant] = max(plants.values(), default=0) + 1
-        garden.append([plants[c] for c in line.strip()])
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-s",
+        "--strategy",
+        choices=["label", "walk", "crop"],
+        default="label",
+        help="how to measure regions (default: %(default)s)",
+    )
+    args = parser.parse_args()
 
-garden = np.array(garden)
-cost1, cost2 = main(garden)
+    garden = parse(map_file("input.txt"))
 
-print("1:", cost1)
-print("2:", cost2)
+    for part, answer in enumerate(solve(garden, args.strategy), 1):
+        print(f"{part}:", answer)
@@ -0,0 +1,51 @@
+"""Advent of Code 2024 - Day 2
+
+Author: Alexander Bessman
+
+Generate reports of any number. Reports start out safe, and then some of their levels
+are disturbed, so that there is a mix of safe, almost safe, and unsafe reports.
+"""
+
+import random
+
+
+SIZE = 1000
+
+
+def generate(
+    size: int,
+    seed: int = 0,
+    length: tuple[int, int] = (5, 8),
+    noise: float = 0.1,
+) -> bytes:
+    """Generate reports of levels.
+
+    Parameters
+    ----------
+    size : int
+        Number of reports.
+    seed : int
+    length : tuple[int, int]
+        Smallest and largest number of levels in a report.
+    noise : float
+        Probability of each level being replaced by a random one.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    lines = []
+
+    for _ in range(size):
+        direction = rng.choice((-1, 1))
+        level = rng.randint(20, 80)
+        report = []
+
+        for _ in range(rng.randint(*length)):
+            report.append(rng.randint(1, 99) if rng.random() < noise else level)
+            level += direction * rng.randint(1, 3)
+
+        lines.append(" ".join(map(str, report)))
+
+    return ("\n".join(lines) + "\n").encode()
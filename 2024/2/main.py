@@ -3,64 +3,177 @@
 Author: Alexander Bessman
 """
 
-from typing import Literal, Optional
-
-
-def is_monotonic(
-    report: list[int],
-    threshold: Optional[int] = None,
-    almost: bool = False,
-) -> bool:
-    previous = report[0]
-    direction = sign(report[1] - previous)
-
-    for i, level in enumerate(report[1:]):
-        if direction == 0:
-            break
-        if sign(level - previous) != direction:
-            break
-        if abs(level - previous) > threshold:
-            break
-        previous = level
+import argparse
+import mmap
+from collections import defaultdict
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+
+def is_monotonic(report: Sequence[int], threshold: int = 3) -> tuple[bool, bool]:
+    """Check if a report is safe, without and with the Problem Dampener.
+
+    This is done in a single pass over the report. For each direction, keep track of
+    whether the levels up to and including the current one are safe with no level
+    removed, and with exactly one earlier level removed.
+
+    Parameters
+    ----------
+    report : Sequence[int]
+    threshold : int
+        Largest allowed difference between adjacent levels.
+
+    Returns
+    -------
+    safe, safeish : tuple[bool, bool]
+        Whether the report is safe as is, and whether it is safe after removing at
+        most one level.
+    """
+    if len(report) < 3:
+        safe = len(report) < 2 or 1 <= abs(report[1] - report[0]) <= threshold
+        return safe, True
+
+    t = threshold
+    a, b = report[0], report[1]
+    # Safe so far with no level removed, up to the current and the previous level.
+    up = 1 <= b - a <= t
+    down = 1 <= a - b <= t
+    up_previous = down_previous = True
+    # Safe so far with one level removed. Removing the first level is always fine.
+    up_removed = down_removed = True
+
+    for c in report[2:]:
+        step = c - b
+        skip = c - a
+        up_removed = (up_removed and 1 <= step <= t) or (up_previous and 1 <= skip <= t)
+        down_removed = (down_removed and 1 <= -step <= t) or (
+            down_previous and 1 <= -skip <= t
+        )
+        up_previous, up = up, up and 1 <= step <= t
+        down_previous, down = down, down and 1 <= -step <= t
+
+        if not (up_previous or down_previous or up_removed or down_removed):
+            return False, False
+
+        a, b = b, c
+
+    safe = up or down
+    # Removing the last level is the same as being safe up to the previous level.
+    safeish = safe or up_removed or down_removed or up_previous or down_previous
+    return safe, safeish
+
+
+def is_monotonic_batch(
+    reports: npt.NDArray[np.integer],
+    threshold: int = 3,
+) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+    """Check if reports of equal length are safe, without and with the Problem Dampener.
+
+    Parameters
+    ----------
+    reports : NDArray[integer]
+        One report per row.
+    threshold : int
+        Largest allowed difference between adjacent levels.
+
+    Returns
+    -------
+    safe, safeish : tuple[NDArray[bool], NDArray[bool]]
+        One element per report.
+    """
+    n = reports.shape[1]
+
+    if n < 3:
+        # Removing a level always leaves at most one, which is safe.
+        steps = np.abs(np.diff(reports, axis=1))
+        safe = ((1 <= steps) & (steps <= threshold)).all(axis=1)
+        return safe, np.ones(len(reports), dtype=bool)
+
+    safe = np.zeros(len(reports), dtype=bool)
+    safeish = np.zeros(len(reports), dtype=bool)
+
+    for direction in (1, -1):
+        steps = np.diff(reports, axis=1) * direction
+        skips = (reports[:, 2:] - reports[:, :-2]) * direction
+        ok_step = (1 <= steps) & (steps <= threshold)
+        ok_skip = (1 <= skips) & (skips <= threshold)
+        # Whether all steps before/after each step are ok, padded so that removing
+        # the first or last level is handled like any other.
+        ones = np.ones((len(reports), 1), dtype=bool)
+        before = np.hstack([ones, np.logical_and.accumulate(ok_step, axis=1)])
+        after = np.hstack(
+            [np.logical_and.accumulate(ok_step[:, ::-1], axis=1)[:, ::-1], ones]
+        )
+        safe |= before[:, -1]
+
+        # Removing level j drops steps j-1 and j, and adds a skip from j-1 to j+1.
+        safeish |= after[:, 1] | before[:, n - 2]
+
+        for j in range(1, n - 1):
+            safeish |= before[:, j - 1] & ok_skip[:, j - 1] & after[:, j + 1]
+
+    return safe, safeish | safe
+
+
+def group_reports(reports: Iterable[list[int]]) -> dict[int, npt.NDArray[np.int64]]:
+    """Pack reports into 2D arrays, one for each report length."""
+    groups = defaultdict(list)
+
+    for report in reports:
+        groups[len(report)].append(report)
+
+    return {n: np.array(reports, dtype=np.int64) for n, reports in groups.items()}
+
+
+def parse(buffer: bytes | mmap.mmap) -> list[list[int]]:
+    """Return the levels of each report."""
+    return [
+        [int(level) for level in line.split()] for line in bytes(buffer).splitlines()
+    ]
+
+
+def solve(reports: list[list[int]], batch: bool = False) -> Iterator[int]:
+    """Yield the number of safe reports, without and with the Problem Dampener.
+
+    Parameters
+    ----------
+    reports : list[list[int]]
+    batch : bool
+        If True, evaluate reports of equal length together using
+        `is_monotonic_batch`.
+    """
+    safe = 0
+    safeish = 0
+
+    if batch:
+        for group in group_reports(reports).values():
+            s, ss = is_monotonic_batch(group, threshold=3)
+            safe += int(s.sum())
+            safeish += int(ss.sum())
     else:
-        return True
-
-    if almost:
-        tmp = report[:]
-        tmp.pop(i - 1)
-
-        if is_monotonic(tmp, threshold=threshold):
-            return True
-
-        tmp = report[:]
-        tmp.pop(i)
-
-        if is_monotonic(tmp, threshold=threshold):
-            return True
-
-        tmp = report[:]
-        tmp.pop(i + 1)
-        return is_monotonic(tmp, threshold=threshold)
-
-    return False
-
-
-def sign(n: int) -> Literal[1, 0, -1]:
-    if n > 0:
-        return 1
-    if n == 0:
-        return 0
-    return -1
-
-
-safe = 0
-safeish = 0
-
-with open("input.txt") as f:
-    for line in f:
-        report = [int(level) for level in line.split()]
-        safe += is_monotonic(report, threshold=3)
-        safeish += is_monotonic(report, threshold=3, almost=True)
-
-print("1:", safe)
-print("2:", safeish)
+        for report in reports:
+            s, ss = is_monotonic(report, threshold=3)
+            safe += s
+            safeish += ss
+
+    yield safe
+    yield safeish
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-b",
+        "--batch",
+        action="store_true",
+        help="evaluate reports of equal length together, using NumPy",
+    )
+    args = parser.parse_args()
+
+    with open("input.txt", "rb") as f:
+        reports = parse(f.read())
+
+    for part, answer in enumerate(solve(reports, batch=args.batch), 1):
+        print(f"{part}:", answer)
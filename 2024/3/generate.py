@@ -0,0 +1,61 @@
+"""Advent of Code 2024 - Day 3
+
+Author: Alexander Bessman
+
+Generate corrupted memory of any length. Valid instructions are mixed with junk, which
+includes near misses such as mul(4*, mul(1234,5) and don't without parentheses.
+"""
+
+import random
+
+
+SIZE = 700
+
+JUNK = [
+    "mul(4*",
+    "mul(1234,5)",
+    "mul[3,7]",
+    "mul ( 2 , 4 )",
+    "?(12,34)",
+    "don't",
+    "do",
+    "select()",
+    "from()",
+    "!",
+    ")",
+    "'",
+    "%",
+    "@",
+    "#",
+    "mul(",
+    "\n",
+]
+
+
+def generate(size: int, seed: int = 0, toggles: float = 0.1) -> bytes:
+    """Generate a memory dump.
+
+    Parameters
+    ----------
+    size : int
+        Number of instructions, not counting junk.
+    seed : int
+    toggles : float
+        Fraction of instructions which are do() or don't().
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    parts = []
+
+    for _ in range(size):
+        parts.extend(rng.choices(JUNK, k=rng.randint(0, 6)))
+
+        if rng.random() < toggles:
+            parts.append(rng.choice(("do()", "don't()")))
+        else:
+            parts.append(f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})")
+
+    return ("".join(parts) + "\n").encode()
@@ -1,25 +1,83 @@
 """Advent of Code 2024 - Day 3
 
 Author: Alexander Bessman
+
+The memory dump is scanned once for all three instructions, keeping track of whether
+mul instructions are enabled along the way. The dump is read in chunks, so it never
+needs to fit in memory.
 """
 
+import io
+import mmap
 import re
-from operator import mul
+from typing import BinaryIO, Iterator
+
+
+instruction_pattern = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|(do\(\))|don't\(\)")
+LONGEST_INSTRUCTION = len(b"mul(123,123)")
+
+
+def scan(f: BinaryIO, chunksize: int = 2**20) -> tuple[int, int]:
+    """Sum the results of all mul instructions, and of the enabled ones only.
+
+    Parameters
+    ----------
+    f : BinaryIO
+        Memory dump.
+    chunksize : int
+        Number of bytes to read at a time.
+
+    Returns
+    -------
+    total, enabled_total : tuple[int, int]
+    """
+    total = 0
+    enabled_total = 0
+    enabled = True
+    buffer = b""
+
+    while True:
+        chunk = f.read(chunksize)
+        buffer += chunk
+        # Instructions which start this close to the end of the buffer may continue
+        # in the next chunk, so leave them for the next round.
+        cut = len(buffer) - (LONGEST_INSTRUCTION - 1) if chunk else len(buffer)
+        end = 0
+
+        for match in instruction_pattern.finditer(buffer):
+            if match.start() >= cut:
+                break
+
+            a, b, do = match.groups()
+            end = match.end()
+
+            if a:
+                result = int(a) * int(b)
+                total += result
+                enabled_total += result * enabled
+            else:
+                enabled = bool(do)
+
+        if not chunk:
+            return total, enabled_total
+
+        buffer = buffer[max(end, cut) :]
 
 
-mul_pattern = re.compile(r"mul\(\d{1,3},\d{1,3}\)")
+def parse(buffer: bytes | mmap.mmap) -> bytes:
+    """The memory dump is scanned as is."""
+    return bytes(buffer)
 
-with open("input.txt") as f:
-    mem = f.read()
 
-muls = re.findall(mul_pattern, mem)
-print("1:", sum(eval(m) for m in muls))
+def solve(dump: bytes) -> Iterator[int]:
+    """Yield the sum of all mul instructions, and of the enabled ones only."""
+    yield from scan(io.BytesIO(dump))
 
-enabled_mem = mem.split("don't()")[0]
 
-for section in mem.split("don't()")[1:]:
-    segments = section.split("do()")
-    enabled_mem += "".join(segments[1:])
+if __name__ == "__main__":
+    # Scan the file directly, so that it is read in chunks.
+    with open("input.txt", "rb") as f:
+        total, enabled_total = scan(f)
 
-enabled_muls = re.findall(mul_pattern, enabled_mem)
-print("2:", sum(eval(m) for m in enabled_muls))
+    print("1:", total)
+    print("2:", enabled_total)
@@ -0,0 +1,34 @@
+"""Advent of Code 2024 - Day 4
+
+Author: Alexander Bessman
+
+Generate word searches of any size, filled with random letters.
+"""
+
+import math
+import random
+
+
+SIZE = 140 * 140
+
+
+def generate(size: int, seed: int = 0, letters: str = "XMAS") -> bytes:
+    """Generate a square word search.
+
+    Parameters
+    ----------
+    size : int
+        Number of letters. The side of the square is rounded to the nearest integer.
+    seed : int
+    letters : str
+        Letters to pick from.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    side = max(1, round(math.sqrt(size)))
+    return b"".join(
+        "".join(rng.choices(letters, k=side)).encode() + b"\n" for _ in range(side)
+    )
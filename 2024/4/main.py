@@ -2,44 +2,149 @@
 
 Author: Alexander Bessman
 
-This solution uses template matching via OpenCV. Essentially, the input is treated as a
-bitmap image with four colors, and the target words as smaller images to be found within
-that image.
+This solution uses template matching. Essentially, the input is treated as a bitmap
+image with four colors, and the target words as smaller images to be found within that
+image. Rather than matching each template separately, the puzzle is split into one
+boolean plane per color, and each letter of each template is matched by taking a
+shifted view of the corresponding plane.
 """
 
-import cv2
+import argparse
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, Sequence
+
 import numpy as np
 import numpy.typing as npt
 
+from aoc.grid import char_view, lookup, map_file
+
+
 X, M, A, S = 1, 2, 3, 4
 
+LETTERS = np.zeros(256, dtype=np.uint8)
+LETTERS[[ord(c) for c in "XMAS"]] = X, M, A, S
+
+
+def read_puzzle(buffer: bytes | mmap.mmap) -> npt.NDArray[np.uint8]:
+    """Convert text to a 2D array of letter codes, with 0 for any other character."""
+    return lookup(char_view(buffer), LETTERS)
+
+
+def count_words(
+    puzzle: npt.NDArray[np.uint8],
+    words: Sequence[npt.NDArray[np.uint8]],
+    rows: Optional[int] = None,
+) -> list[int]:
+    """Count occurrences of each word in the puzzle.
+
+    Parameters
+    ----------
+    puzzle : NDArray[uint8]
+    words : Sequence[NDArray[uint8]]
+        Templates to look for. Zeros in a template match anything.
+    rows : Optional[int]
+        Only count matches whose top row is among the first 'rows' rows of the puzzle.
+        Defaults to all rows.
+
+    Returns
+    -------
+    list[int]
+        Number of matches for each template.
+    """
+    height, width = puzzle.shape
+    height = min(height, rows or height)
+    size = max(max(w.shape) for w in words)
+    # Pad so that every template can be anchored at every location; the padding
+    # never matches a letter.
+    padded = np.pad(puzzle, ((0, size - 1), (0, size - 1)))
+    planes = {letter: padded == letter for letter in (X, M, A, S)}
+    counts = []
+
+    for word in words:
+        found = np.ones((height, width), dtype=bool)
+
+        for row, col in zip(*word.nonzero()):
+            found &= planes[word[row, col]][row : row + height, col : col + width]
+
+        counts.append(int(np.count_nonzero(found)))
+
+    return counts
+
 
 def count_word(puzzle: npt.NDArray[np.uint8], word: npt.NDArray[np.uint8]) -> int:
-    mask = (word != 0).astype(np.uint8)
-    result = cv2.matchTemplate(puzzle, word, cv2.TM_SQDIFF, mask=mask)
-    return np.count_nonzero(result == 0)
-
-
-# %% Load input
-with open("input.txt") as f:
-    puzzle = np.vstack(
-        [
-            np.array(
-                [{"X": X, "M": M, "A": A, "S": S}[c] for c in line], dtype=np.uint8
-            )
-            for line in f.read().splitlines()
-        ]
-    )
+    return count_words(puzzle, [word])[0]
+
+
+def count_words_tiled(
+    path: str,
+    words: Sequence[npt.NDArray[np.uint8]],
+    band_rows: int = 1024,
+    workers: Optional[int] = 0,
+) -> list[int]:
+    """Count occurrences of each word in a puzzle file, one band of rows at a time.
+
+    The file is memory-mapped, and only one band of the puzzle is converted at a time
+    (per worker), so the puzzle does not need to fit in memory. Consecutive bands
+    overlap by one row less than the tallest word, and each band only counts matches
+    whose top row is in the band proper, so that each match is counted exactly once.
+
+    Parameters
+    ----------
+    path : str
+        Puzzle file.
+    words : Sequence[NDArray[uint8]]
+        Templates to look for. Zeros in a template match anything.
+    band_rows : int
+        Number of rows per band, not counting the overlap.
+    workers : Optional[int]
+        Number of worker processes. If 0, bands are processed in this process. If
+        None, use one worker per CPU.
+
+    Returns
+    -------
+    list[int]
+        Number of matches for each template.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        stride = m.find(b"\n") + 1 or len(m) + 1
+        # The last line may lack a newline.
+        num_rows = -(-len(m) // stride)
+
+    overlap = max(w.shape[0] for w in words) - 1
+    bands = [
+        (path, stride, start, min(start + band_rows + overlap, num_rows), band_rows)
+        for start in range(0, num_rows, band_rows)
+    ]
+
+    if workers == 0:
+        counts = map(_count_band, *zip(*bands), [words] * len(bands))
+        return [sum(c) for c in zip(*counts)]
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        counts = executor.map(_count_band, *zip(*bands), [words] * len(bands))
+        return [sum(c) for c in zip(*counts)]
+
+
+def _count_band(
+    path: str,
+    stride: int,
+    start: int,
+    stop: int,
+    rows: int,
+    words: Sequence[npt.NDArray[np.uint8]],
+) -> list[int]:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        band = read_puzzle(m[start * stride : stop * stride])
+
+    return count_words(band, words, rows)
+
 
-# %% Part 1
 xmas = np.array([[X, M, A, S]], dtype=np.uint8)
 xmas_diag = np.diag(xmas[0])
-words = (np.rot90(w, i) for w in (xmas, xmas_diag) for i in range(4))
-solution = sum(count_word(puzzle, w) for w in words)
-# %%
-print("1:", solution)
+words1 = [np.rot90(w, i) for w in (xmas, xmas_diag) for i in range(4)]
 
-# %% Part 2
 x_mas = np.array(
     [
         [M, 0, M],
@@ -48,7 +153,51 @@ x_mas = np.array(
     ],
     dtype=np.uint8,
 )
-words = (np.rot90(x_mas, i) for i in range(4))
-solution = sum(count_word(puzzle, w) for w in words)
-# %%
-print("2:", solution)
+words2 = [np.rot90(x_mas, i) for i in range(4)]
+
+
+def parse(buffer: bytes | mmap.mmap) -> npt.NDArray[np.uint8]:
+    return read_puzzle(buffer)
+
+
+def solve(puzzle: npt.NDArray[np.uint8]) -> Iterator[int]:
+    """Yield the number of XMAS and X-MAS occurrences."""
+    counts = count_words(puzzle, words1 + words2)
+    yield sum(counts[: len(words1)])
+    yield sum(counts[len(words1) :])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-b",
+        "--band-rows",
+        type=int,
+        default=0,
+        help="memory-map the input and search it in bands of this many rows "
+        "(default: load the whole puzzle)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes for banded search, 0 to run serially "
+        "(default: one per CPU)",
+    )
+    args = parser.parse_args()
+
+    if args.band_rows:
+        counts = count_words_tiled(
+            "input.txt",
+            words1 + words2,
+            band_rows=args.band_rows,
+            workers=args.workers,
+        )
+        print("1:", sum(counts[: len(words1)]))
+        print("2:", sum(counts[len(words1) :]))
+    else:
+        puzzle = parse(map_file("input.txt"))
+
+        for part, answer in enumerate(solve(puzzle), 1):
+            print(f"{part}:", answer)
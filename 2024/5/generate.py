@@ -0,0 +1,55 @@
+"""Advent of Code 2024 - Day 5
+
+Author: Alexander Bessman
+
+Generate print queues of any length. The rules order every pair of pages, following a
+random permutation, so every update can be sorted. About half of the updates are
+already in order.
+"""
+
+import random
+
+
+SIZE = 200
+
+
+def generate(
+    size: int,
+    seed: int = 0,
+    pages: int = 49,
+    length: tuple[int, int] = (5, 23),
+) -> bytes:
+    """Generate page ordering rules and updates.
+
+    Parameters
+    ----------
+    size : int
+        Number of updates.
+    seed : int
+    pages : int
+        Number of distinct pages, at most 90.
+    length : tuple[int, int]
+        Smallest and largest number of pages in an update. Lengths are always odd.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    order = rng.sample(range(10, 100), pages)
+    rank = {page: i for i, page in enumerate(order)}
+    rules = [(a, b) for i, a in enumerate(order) for b in order[i + 1 :]]
+    rng.shuffle(rules)
+    lines = [f"{a}|{b}" for a, b in rules]
+    lines.append("")
+
+    for _ in range(size):
+        n = rng.randrange(length[0] | 1, min(length[1], pages) + 1, 2)
+        update = rng.sample(order, n)
+
+        if rng.random() < 0.5:
+            update.sort(key=rank.__getitem__)
+
+        lines.append(",".join(map(str, update)))
+
+    return ("\n".join(lines) + "\n").encode()
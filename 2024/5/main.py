@@ -2,54 +2,95 @@
 
 Author: Alexander Bessman
 
-This solution treats the input as (several) systems of inequalities, which can be solved
-with linear programming.
+This solution treats the page ordering rules as a directed graph. The graph as a whole
+cannot be sorted because it contains loops, but the pages involved in a single update
+never contain loops, and thus CAN be sorted topologically.
 """
 
-from scipy.optimize import linprog
+import mmap
+from collections import defaultdict
+from typing import Iterable, Iterator
 
 
-def sort_update(update: list[int], rules: list[tuple[int, int]]) -> list[int]:
-    A = []
+def index_rules(rules: Iterable[tuple[int, int]]) -> dict[int, set[int]]:
+    """Map each page to the set of pages which must come after it."""
+    successors = defaultdict(set)
 
     for small, big in rules:
-        ub = [0] * len(update)
-        ub[update.index(small)] = 1
-        ub[update.index(big)] = -1
-        A.append(ub)
-
-    b = [-1] * len(A)
-    c = [1] * len(update)
-    bounds = [(0, None)] * len(update)
-    res = linprog(c, A_ub=A, b_ub=b, bounds=bounds)
-    key = {k: int(v) for k, v in zip(update, res.x)}
-    return sorted(update, key=lambda k: key[k])
-
-
-with open("input.txt") as f:
-    k = 0
-    rules = []
-
-    while "|" in (line := next(f)):
-        rules.append([int(i) for i in line.strip().split("|")])
-
-    updates = [[int(i) for i in line.strip().split(",")] for line in f]
-
-middle_correct = []
-middle_wrong = []
-
-# The problem as a whole cannot be viewed as a linear programming problem because the
-# page relationships contain loops. But the pages involved in a single update never
-# contain loops, and thus CAN be viewed as a LP problem.
-for update in updates:
-    active_rules = [(a, b) for a, b in rules if a in update and b in update]
-    sorted_update = sort_update(update, active_rules)
-    middle = sorted_update[(len(sorted_update) - 1) // 2]
-
-    if sorted_update == update:
-        middle_correct.append(middle)
-    else:
-        middle_wrong.append(middle)
-
-print("1:", sum(middle_correct))
-print("2:", sum(middle_wrong))
+        successors[small].add(big)
+
+    return successors
+
+
+def is_sorted(update: list[int], successors: dict[int, set[int]]) -> bool:
+    """Check that no page in 'update' must come before a page preceding it."""
+    seen = set()
+
+    for page in update:
+        if not successors[page].isdisjoint(seen):
+            return False
+
+        seen.add(page)
+
+    return True
+
+
+def sort_update(update: list[int], successors: dict[int, set[int]]) -> list[int]:
+    """Sort pages with Kahn's algorithm, using only rules between pages in 'update'."""
+    pages = set(update)
+    after = {page: successors[page] & pages for page in update}
+    indegree = dict.fromkeys(update, 0)
+
+    for page in update:
+        for big in after[page]:
+            indegree[big] += 1
+
+    ready = [page for page in update if not indegree[page]]
+    sorted_update = []
+
+    while ready:
+        page = ready.pop()
+        sorted_update.append(page)
+
+        for big in after[page]:
+            indegree[big] -= 1
+
+            if not indegree[big]:
+                ready.append(big)
+
+    return sorted_update
+
+
+def parse(buffer: bytes | mmap.mmap) -> tuple[list[tuple[int, int]], list[list[int]]]:
+    """Return the page ordering rules and the updates."""
+    rules, updates = bytes(buffer).decode().split("\n\n")
+    return (
+        [tuple(int(i) for i in line.split("|")) for line in rules.split()],
+        [[int(i) for i in line.split(",")] for line in updates.split()],
+    )
+
+
+def solve(manual: tuple[list[tuple[int, int]], list[list[int]]]) -> Iterator[int]:
+    """Yield the sum of middle pages of the correct updates, then of the fixed ones."""
+    rules, updates = manual
+    successors = index_rules(rules)
+    middle_correct = []
+    middle_wrong = []
+
+    for update in updates:
+        if is_sorted(update, successors):
+            middle_correct.append(update[(len(update) - 1) // 2])
+        else:
+            sorted_update = sort_update(update, successors)
+            middle_wrong.append(sorted_update[(len(sorted_update) - 1) // 2])
+
+    yield sum(middle_correct)
+    yield sum(middle_wrong)
+
+
+if __name__ == "__main__":
+    with open("input.txt", "rb") as f:
+        manual = parse(f.read())
+
+    for part, answer in enumerate(solve(manual), 1):
+        print(f"{part}:", answer)
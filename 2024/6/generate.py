@@ -0,0 +1,93 @@
+"""Advent of Code 2024 - Day 6
+
+Author: Alexander Bessman
+
+Generate labs of any size. With obstacles scattered uniformly at random, the guard
+walks out of the lab within a few hundred steps whatever its size, so the guard's route
+is laid out first, and obstacles are scattered everywhere else. The route is an outward
+spiral, each stretch longer than the parallel stretch before it by a random gap, so that
+it winds around the lab without ever crossing itself, and then leaves it. It covers
+roughly the same share of the lab at every size, so that the work of part 2 grows with
+the lab as it does for real puzzle inputs.
+"""
+
+import math
+import random
+
+
+SIZE = 130 * 130
+
+
+def generate(
+    size: int,
+    seed: int = 0,
+    density: float = 0.045,
+    gap: tuple[int, int] = (2, 8),
+) -> bytes:
+    """Generate a square lab.
+
+    Parameters
+    ----------
+    size : int
+        Number of positions. The side of the square is rounded to the nearest
+        integer.
+    seed : int
+    density : float
+        Probability of each position off the guard's route holding an obstacle.
+    gap : tuple[int, int]
+        Smallest and largest distance between successive turns of the guard's spiral
+        route. Must be at least 2, or the obstacles which turn the guard would lie on
+        its route.
+
+    Returns
+    -------
+    bytes
+    """
+    if gap[0] < 2:
+        raise ValueError("gap must be at least 2")
+
+    rng = random.Random(seed)
+    side = max(1, round(math.sqrt(size)))
+    lab = [
+        ["#" if rng.random() < density else "." for _ in range(side)]
+        for _ in range(side)
+    ]
+    row = rng.randrange(side // 3, side - side // 3)
+    col = rng.randrange(side // 3, side - side // 3)
+    lab[row][col] = "^"
+    _spiral(lab, row, col, gap, rng)
+    return b"".join("".join(line).encode() + b"\n" for line in lab)
+
+
+def _spiral(
+    lab: list[list[str]],
+    row: int,
+    col: int,
+    gap: tuple[int, int],
+    rng: random.Random,
+) -> None:
+    """Clear a spiral route from the guard out of the lab, and block each turn.
+
+    Each stretch reaches at least two positions beyond every earlier stretch, so
+    neither the route nor the obstacles which end its stretches are ever overwritten.
+    """
+    drow, dcol = -1, 0
+    lengths = (0, 0)  # Of the last two stretches.
+
+    while True:
+        length = lengths[0] + rng.randint(*gap)
+        lengths = (lengths[1], length)
+
+        for _ in range(length):
+            row, col = row + drow, col + dcol
+
+            if not (0 <= row < len(lab) and 0 <= col < len(lab)):
+                return
+
+            lab[row][col] = "."
+
+        if not (0 <= row + drow < len(lab) and 0 <= col + dcol < len(lab)):
+            return
+
+        lab[row + drow][col + dcol] = "#"
+        drow, dcol = dcol, -drow
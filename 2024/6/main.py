@@ -3,206 +3,349 @@
 Author: Alexander Bessman
 
 This is a brute-force solution.
+
+Locations are flat indices into the padded lab, and the guard's state is its location
+and direction packed into a single int, location * 4 + direction. This way, guard
+states can be recorded in a preallocated bytearray rather than hashed into a set.
 """
 
 from __future__ import annotations
 
-from copy import copy
-from dataclasses import astuple, dataclass
-from typing import Literal, NamedTuple, Iterable
-
-
-Direction = Literal[-1j, 1, 1j, -1]
-
-
-class CRange:
-    def __init__(
-        self,
-        start: complex | int,
-        stop: complex | int,
-        step: complex | int,
-    ) -> None:
-        self.start = start
-        self.stop = stop
-        self.step = step
-
-        if ((self.stop - self.start) / self.step).imag:
-            raise ValueError("'stop' not in range")
-
-    def __contains__(self, value: complex) -> bool:
-        inline = (value - self.start) / self.step
+import argparse
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, NamedTuple
 
-        if inline.imag:
-            # value is on a different vector.
-            return False
+import numpy as np
+import numpy.typing as npt
 
-        if int(inline.real) != inline.real:
-            # value is not on a step.
-            return False
+from aoc.grid import TURN_RIGHT, UP, Grid, char_view, locate, lookup, map_file
 
-        ratio = (value - self.start) / (self.stop - self.start)
-        assert ratio.imag == 0
 
-        if 0 <= ratio.real < 1:
-            return True
+FREE, OBSTACLE, OUTSIDE = range(3)
 
-        # value is outside range.
-        return False
 
-    def __iter__(self) -> Iterable[complex | int]:
-        # if self.step.real:
-        #     rrange = range(*map(int, (self.start.real, self.stop.real, self.step.real)))
-        # else:
-        #     rrange = repeat(0)
-        # if self.step.imag:
-        #     irange = range(*map(int, (self.start.imag, self.stop.imag, self.step.imag)))
-        # else:
-        #     irange = repeat(0)
-        # yield from (r + i * 1j for r, i in zip(rrange, irange))
-        inline = (self.stop - self.start) / self.step
+class Lab(NamedTuple):
+    """Lab layout, and where the guard stops when walking from any location.
 
-        if inline.imag or inline.real <= 0:
-            return
-
-        i = self.start
+    For every location and direction, the flat index of the first obstacle or border
+    cell ahead is precomputed, so that walking to the next obstacle is a lookup. A
+    single extra obstacle can be overlaid on an existing lab without recomputing.
+    """
 
-        while (
-            i.real * self.step.real <= self.stop.real * self.step.real
-            and i.imag * self.step.imag < self.stop.imag * self.step.imag
-        ) or (
-            i.real * self.step.real < self.stop.real * self.step.real
-            and i.imag * self.step.imag <= self.stop.imag * self.step.imag
+    grid: Grid
+    # First blocked location ahead, for each direction. Memoryviews of the rows of one
+    # intp array, since indexing them is several times faster than indexing the array.
+    stops: tuple[memoryview, ...]
+    outside: memoryview  # 1 for border cells, 0 elsewhere.
+    extra: int | None = None
+
+    @classmethod
+    def from_cells(cls, cells: npt.NDArray[np.uint8]) -> Lab:
+        """Build a lab from a 2D array of FREE and OBSTACLE."""
+        grid = Grid(cells, fill=OUTSIDE)
+        blocked = grid.padded != FREE
+        height, width = blocked.shape
+        stops = np.zeros((4, height, width), dtype=np.intp)
+        up, right, down, left = stops
+
+        # Every row and column of the padded lab ends in a blocked border cell. So when
+        # walking right from a cell, the first blocked cell ahead is the next blocked
+        # cell in row-major order, and when walking left it is the previous one.
+        # Likewise for walking down and up, in column-major order. The guard never
+        # stands on the border, so it does not matter where border cells' stops point.
+        order = np.flatnonzero(blocked)
+        right[:], left[:] = _nearest(order, order, (height, width))
+        order = np.flatnonzero(blocked.T)
+        col, row = np.divmod(order, height)
+        down.T[:], up.T[:] = _nearest(order, row * width + col, (width, height))
+
+        outside = (grid.cells == OUTSIDE).view(np.uint8)
+        return cls.from_arrays(grid, stops.reshape(4, -1), outside)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        grid: Grid,
+        stops: npt.NDArray[np.intp],
+        outside: npt.NDArray[np.uint8],
+        extra: int | None = None,
+    ) -> Lab:
+        """Build a lab from an array of stops, with one row per direction."""
+        stops = tuple(memoryview(row) for row in stops)
+        return cls(grid, stops, memoryview(outside), extra)
+
+    def __reduce__(self):
+        # Memoryviews cannot be pickled, so the arrays they view are pickled instead.
+        stops = np.stack([np.asarray(row) for row in self.stops])
+        outside = np.asarray(self.outside)
+        return type(self).from_arrays, (self.grid, stops, outside, self.extra)
+
+    def with_obstacle(self, pos: int) -> Lab:
+        """Return a copy of the lab with one extra obstacle, sharing the lookups."""
+        return self._replace(extra=pos)
+
+    def state(self, row: int, col: int, dir: int) -> int:
+        """Pack a guard location and direction into a single int."""
+        return self.grid.index(row, col) * 4 + dir
+
+    def step(self, dir: int) -> int:
+        """Return the change in flat index when moving one step in direction 'dir'."""
+        return self.grid.offsets[dir]
+
+    def run(self, pos: int, dir: int) -> tuple[int, bool]:
+        """Move from 'pos' in direction 'dir' until the next obstacle or the edge.
+
+        Parameters
+        ----------
+        pos : int
+            Flat index of starting location.
+        dir : int
+            One of UP, RIGHT, DOWN, LEFT.
+
+        Returns
+        -------
+        end : int
+            Flat index of the last location before the obstacle or edge.
+        blocked : bool
+            True if stopped by an obstacle, False if the next step leaves the grid.
+        """
+        stop = self.stops[dir][pos]
+        step = self.grid.offsets[dir]
+        extra = self.extra
+
+        # The extra obstacle is in the way if it lies between 'pos' and 'stop', a
+        # whole number of steps away.
+        if (
+            extra is not None
+            and 0 < (extra - pos) * step < (stop - pos) * step
+            and (extra - pos) % step == 0
         ):
-            yield i
-            i += self.step
-
-    def __repr__(self) -> str:
-        return f"CRange({self.start}, {self.stop}, {self.step})"
+            return extra - step, True
 
+        return stop - step, not self.outside[stop]
 
-class Grid(NamedTuple):
-    size: complex
-    obstacles: set[complex]
 
-    def __contains__(self, value: complex) -> bool:
-        return (0 <= value.real < self.size.real) and (0 <= value.imag < self.size.imag)
+def _nearest(
+    order: npt.NDArray[np.intp],
+    found: npt.NDArray[np.intp],
+    shape: tuple[int, int],
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Find the next and the previous blocked cell of every cell, in some flat order.
 
+    Parameters
+    ----------
+    order : NDArray[intp]
+        Positions of the blocked cells in the order, ascending.
+    found : NDArray[intp]
+        Flat indices into the lab of the same cells.
+    shape : tuple[int, int]
+        Shape of the lab, such that the order is row-major.
 
-@dataclass
-class Guard:
-    pos: complex
-    dir: Direction
-
-    def __hash__(self) -> int:
-        return hash(astuple(self))
+    Returns
+    -------
+    ahead, behind : NDArray[intp]
+        Flat index into the lab of the next and previous blocked cell, or 0 if there
+        is none.
+    """
+    gaps = np.diff(order)
+    ahead = np.zeros(shape, dtype=np.intp)
+    ahead.reshape(-1)[order[0] : order[-1]] = np.repeat(found[1:], gaps)
+    behind = np.zeros(shape, dtype=np.intp)
+    behind.reshape(-1)[order[0] + 1 : order[-1] + 1] = np.repeat(found[:-1], gaps)
+    return ahead, behind
 
 
-def walk(guard: Guard, grid: Grid) -> tuple[Guard | None, set[complex]]:
+def walk(state: int, grid: Lab) -> tuple[int | None, int]:
     """Walk guard until next obstacle.
 
     Parameters
     ----------
-    guard : Guard
+    state : int
         Current guard location and direction.
-    grid : Grid
-        Grid size and locations of obstacles.
+    grid : Lab
 
     Return
     ------
-    guard : Guard | None
+    state : int | None
         New location and direction of guard, or None if guard left the grid.
-    traversed : set[complex]
-        All locations traversed by guard, including starting and final location.
+    end : int
+        Last location traversed by guard.
     """
-    match guard.dir:
-        case -1j:
-            stop = guard.pos.real - 1j
-        case 1:
-            stop = grid.size.real + guard.pos.imag * 1j
-        case 1j:
-            stop = guard.pos.real + grid.size.imag * 1j
-        case -1:
-            stop = -1 + guard.pos.imag * 1j
-        case _:
-            raise RuntimeError
-
-    path = CRange(
-        start=guard.pos,
-        stop=stop,
-        step=guard.dir,
-    )
-    obs = min(
-        [o for o in grid.obstacles if o in path],
-        default=path.stop,
-        key=lambda x: abs(x - guard.pos),
-    )
-    traversed = set(CRange(guard.pos, obs, guard.dir))
-    guard.pos = obs - guard.dir
-    guard.dir *= -1j  # Turn right.
+    pos, dir = divmod(state, 4)
+    end, blocked = grid.run(pos, dir)
 
-    if obs in grid:
-        return guard, traversed
+    if blocked:
+        return end * 4 + TURN_RIGHT[dir], end
 
-    return None, traversed
+    return None, end
 
 
-def detect_loop(guard: Guard, grid: Grid) -> bool:
+def detect_loop(state: int, grid: Lab, visited: bytearray) -> bool:
     """Detect if the guard enters a loop.
 
     Parameters
     ----------
-    guard : Guard
-    grid : Grid
+    state : int
+    grid : Lab
+    visited : bytearray
+        Scratch space with one zeroed byte per guard state. It is zeroed again before
+        returning, so it can be reused for the next call.
 
     Returns
     -------
     bool
         True if guard never leaves grid.
     """
-    previous_guard_states = set([guard])
+    previous_guard_states = []
+
+    try:
+        while True:
+            state, _ = walk(state, grid)
+
+            if state is None:
+                return False
+
+            if visited[state]:
+                return True
+
+            visited[state] = 1
+            previous_guard_states.append(state)
+    finally:
+        for s in previous_guard_states:
+            visited[s] = 0
+
+
+def patrol(state: int, grid: Lab) -> tuple[bytearray, list[tuple[int, int]]]:
+    """Follow the guard's route until it leaves the grid.
+
+    Parameters
+    ----------
+    state : int
+    grid : Lab
+
+    Returns
+    -------
+    traversed : bytearray
+        Mask with a 1 for each location traversed by guard.
+    seeds : list[tuple[int, int]]
+        All locations traversed by guard, except the starting location, each paired
+        with the guard state just before the location is first reached.
+    """
+    traversed = bytearray(grid.grid.cells.size)
+    traversed[state // 4] = 1
+    seeds = []
+
+    while state is not None:
+        pos, dir = divmod(state, 4)
+        step = grid.step(dir)
+        state, end = walk(state, grid)
 
-    while guard:
-        guard, _ = walk(guard, grid)
+        for p in range(pos + step, end + step, step):
+            if not traversed[p]:
+                traversed[p] = 1
+                seeds.append((p, (p - step) * 4 + dir))
 
-        if not guard:
-            return False
+    return traversed, seeds
 
-        if guard in previous_guard_states:
-            return True
 
-        previous_guard_states.add(guard)
+def count_loops(
+    seeds: list[tuple[int, int]],
+    grid: Lab,
+    workers: int | None = 0,
+) -> int:
+    """Count the new obstacle locations which would trap the guard in a loop.
 
-    assert False  # Never reached.
+    An obstacle placed at a location which is not on the guard's route has no effect,
+    so only locations on the route are candidates. Up until the guard first reaches
+    the new obstacle it follows its original route, so the walk is started from the
+    guard state just before that point.
 
+    Parameters
+    ----------
+    seeds : list[tuple[int, int]]
+        Candidate obstacle locations and guard states, as returned by `patrol`.
+    grid : Lab
+    workers : int | None
+        Number of worker processes. If 0, candidates are checked in this process. If
+        None, use one worker per CPU.
+
+    Returns
+    -------
+    int
+    """
+    if workers == 0:
+        return _count_loops(seeds, grid)
 
-# %% Load input
-with open("input.txt") as f:
-    raw = f.read()
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, -(-len(seeds) // (4 * workers)))
+    chunks = [seeds[i : i + chunksize] for i in range(0, len(seeds), chunksize)]
 
-width = raw.index("\n")
-height = len(raw.splitlines())
-guard_origin = Guard(complex(*divmod(raw.index("^"), width + 1)), -1)
-obstacles = set()
-lraw = list(raw)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(grid,),
+    ) as executor:
+        return sum(executor.map(_count_loops, chunks))
 
-while "#" in lraw:
-    obstacles.add(complex(*divmod(lraw.index("#"), width + 1)))
-    lraw[lraw.index("#")] = "¤"
 
-grid = Grid(complex(height, width), obstacles)
+_worker_grid: Lab | None = None
 
-# %% Part 1
-traversed = set()
-guard = copy(guard_origin)
 
-while guard:
-    guard, walked = walk(guard, grid)
-    traversed |= walked
+def _init_worker(grid: Lab) -> None:
+    # The base grid is sent once per worker process rather than once per chunk.
+    global _worker_grid
+    _worker_grid = grid
+
+
+def _count_loops(candidates: list[tuple[int, int]], grid: Lab | None = None) -> int:
+    grid = grid or _worker_grid
+    visited = bytearray(grid.grid.cells.size * 4)
+    return sum(
+        detect_loop(state, grid.with_obstacle(pos), visited)
+        for pos, state in candidates
+    )
+
+
+def parse(buffer: bytes | mmap.mmap) -> tuple[Lab, int]:
+    """Return the lab and the guard's initial state."""
+    chars = char_view(buffer)
+    grid = Lab.from_cells(lookup(chars, {"#": OBSTACLE}))
+    (row,), (col,) = locate(chars, "^")["^"]
+    guard_origin = grid.state(int(row), int(col), UP)
+    return grid, guard_origin
+
+
+def solve(lab: tuple[Lab, int], workers: int | None = 0) -> Iterator[int]:
+    """Yield the number of positions visited, then of obstacles which cause a loop.
+
+    Parameters
+    ----------
+    lab : tuple[Lab, int]
+        Lab and the guard's initial state.
+    workers : int | None
+        Number of worker processes for part 2, see `count_loops`.
+    """
+    grid, guard_origin = lab
+    traversed, seeds = patrol(guard_origin, grid)
+    yield traversed.count(1)
+    yield count_loops(seeds, grid, workers=workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes for part 2, 0 to run serially (default: "
+        "one per CPU)",
+    )
+    args = parser.parse_args()
 
-print("1:", len(traversed))
+    lab = parse(map_file("input.txt"))
 
-# %% Part 2
-# Sloooooooow
-new_obstacles = traversed ^ set([guard_origin.pos])
-new_grids = (Grid(grid.size, grid.obstacles | set([o])) for o in new_obstacles)
-print("2:", sum(detect_loop(copy(guard_origin), g) for g in new_grids))
+    for part, answer in enumerate(solve(lab, workers=args.workers), 1):
+        print(f"{part}:", answer)
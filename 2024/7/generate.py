@@ -0,0 +1,66 @@
+"""Advent of Code 2024 - Day 7
+
+Author: Alexander Bessman
+
+Generate calibration equations of any number. Some equations are built by combining
+their numbers with random operators, so that they are solvable with two or three
+operators; the rest get a random test value, and are almost never solvable.
+"""
+
+import random
+
+
+SIZE = 850
+# Solving an equation takes time exponential in its length, in the worst case.
+SCALE = ("length",)
+
+
+def generate(
+    size: int,
+    seed: int = 0,
+    length: tuple[int, int] = (2, 12),
+    solvable: float = 0.5,
+) -> bytes:
+    """Generate calibration equations.
+
+    Parameters
+    ----------
+    size : int
+        Number of equations.
+    seed : int
+    length : tuple[int, int]
+        Smallest and largest number of numbers in an equation.
+    solvable : float
+        Fraction of equations whose test value is made from their numbers.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    lines = []
+
+    for _ in range(size):
+        numbers = [
+            rng.randint(1, 10 ** rng.randint(1, 3) - 1)
+            for _ in range(rng.randint(*length))
+        ]
+
+        if rng.random() < solvable:
+            test_value = numbers[0]
+
+            for n in numbers[1:]:
+                op = rng.choice("+*|")
+
+                if op == "+":
+                    test_value += n
+                elif op == "*":
+                    test_value *= n
+                else:
+                    test_value = int(f"{test_value}{n}")
+        else:
+            test_value = rng.randint(1, 10 ** rng.randint(2, 12))
+
+        lines.append(f"{test_value}: {' '.join(map(str, numbers))}")
+
+    return ("\n".join(lines) + "\n").encode()
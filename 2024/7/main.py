@@ -1,40 +1,322 @@
 """Advent of Code 2024 - Day 7
 
 Author: Alexander Bessman
+
+Equations are solved backwards, from the test value towards the first number. Each
+operator is undone in turn, and branches where an operator cannot be undone (the test
+value is not divisible by the last number, does not end with its digits, etc.) are cut
+off immediately.
 """
 
-from itertools import product
-from math import log10
+import argparse
+import mmap
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
 from operator import add, mul
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Optional
 
 
 def cat(x: int, y: int) -> int:
-    return x * 10 ** (int(log10(y)) + 1) + y
+    return x * 10 ** len(str(y)) + y
+
+
+def uncat(z: int, y: int) -> Optional[int]:
+    m = 10 ** len(str(y))
+    return z // m if z >= y and z % m == y else None
+
+
+def unadd(z: int, y: int) -> Optional[int]:
+    return z - y if z >= y else None
+
+
+def unmul(z: int, y: int) -> Optional[int]:
+    return z // y if y and not z % y else None
+
 
+# Maps each operator to a function which returns x given z = op(x, y) and y, or None if
+# there is no such x. Operators are listed in the order their inverses are tried, most
+# selective first: concatenation only fits when z ends with the digits of y, and
+# multiplication only when y divides z, while addition fits whenever y <= z.
+inverse: dict[Callable[[int, int], int], Callable[[int, int], Optional[int]]] = {
+    cat: uncat,
+    mul: unmul,
+    add: unadd,
+}
 
 ops1 = (add, mul)
 ops2 = (add, mul, cat)
 
 
-with open("input.txt") as f:
-    calibrations = []
+def is_solvable(
+    test_value: int,
+    equation: tuple[int, ...],
+    ops: Iterable[Callable[[int, int], int]],
+) -> bool:
+    """Check if the numbers of 'equation' can be combined into 'test_value'.
+
+    The search is depth-first, with an explicit stack so that long equations do not hit
+    the recursion limit. Inverses are tried in the order of `inverse` regardless of the
+    order of 'ops', so that the branches most likely to be cut off are tried first.
+    Branches are also cut off once the value left to make is larger than anything the
+    remaining numbers can be combined into, which assumes no number is negative.
+
+    Parameters
+    ----------
+    test_value : int
+    equation : tuple[int, ...]
+        Non-negative numbers.
+    ops : Iterable[Callable[[int, int], int]]
+        Operators which may be placed between the numbers. Each must have an entry in
+        `inverse`.
+
+    Returns
+    -------
+    bool
+    """
+    ops = set(ops)
+
+    if not ops <= inverse.keys():
+        raise KeyError(f"no inverse for {ops - inverse.keys()}")
+
+    # Reversed, so that the first inverse is the first one popped off the stack.
+    inverses = [inv for op, inv in reversed(inverse.items()) if op in ops]
+    # Largest value the first n + 1 numbers can be combined into. On non-negative
+    # numbers every operator is non-decreasing in both arguments, so the largest value
+    # of n + 1 numbers is the largest result of applying an operator to the largest
+    # value of n numbers.
+    high = equation[0]
+    highest = [high]
+
+    for y in equation[1:]:
+        high = max([op(high, y) for op in ops])
+        highest.append(high)
+
+    # Pairs of a value, and the number of leading numbers which must combine into it.
+    stack = [(test_value, len(equation))]
+
+    while stack:
+        z, n = stack.pop()
+
+        if z > highest[n - 1]:
+            continue
+
+        if n == 1:
+            if z == equation[0]:
+                return True
+
+            continue
+
+        y = equation[n - 1]
+
+        # Anything times zero is zero, so the leading numbers may combine into any value,
+        # which no inverse can return.
+        if z == 0 and y == 0 and mul in ops:
+            return True
+
+        for inv in inverses:
+            x = inv(z, y)
+
+            if x is not None:
+                stack.append((x, n - 1))
+
+    return False
+
+
+def calibrate(
+    calibrations: Iterable[tuple[int, tuple[int, ...]]],
+    *opsets: tuple[Callable[[int, int], int], ...],
+) -> list[int]:
+    """Sum the test values of the solvable equations, once for each set of operators.
+
+    Parameters
+    ----------
+    calibrations : Iterable[tuple[int, tuple[int, ...]]]
+        Test values and equations.
+    *opsets : tuple[Callable[[int, int], int], ...]
+        Sets of operators.
+
+    Returns
+    -------
+    list[int]
+        Total calibration result for each set of operators.
+    """
+    totals = [0] * len(opsets)
+
+    for test_value, equation in calibrations:
+        solved = None
 
-    for line in f:
+        for i, ops in enumerate(opsets):
+            # An equation solvable with some operators is solvable with more operators.
+            if not (solved and set(solved) <= set(ops)):
+                solved = ops if is_solvable(test_value, equation, ops) else None
+
+            if solved:
+                totals[i] += test_value
+
+    return totals
+
+
+def calibrate_parallel(
+    calibrations: Iterable[tuple[int, tuple[int, ...]]],
+    *opsets: tuple[Callable[[int, int], int], ...],
+    workers: Optional[int] = None,
+    chunksize: int = 1000,
+) -> Iterator[tuple[int, int, list[int], float]]:
+    """Calibrate chunks of equations in a process pool.
+
+    Chunks are read from 'calibrations' only as workers become available, so the
+    calibrations do not all need to be in memory at once.
+
+    Parameters
+    ----------
+    calibrations : Iterable[tuple[int, tuple[int, ...]]]
+        Test values and equations.
+    *opsets : tuple[Callable[[int, int], int], ...]
+        Sets of operators.
+    workers : Optional[int]
+        Number of worker processes. Defaults to one per CPU.
+    chunksize : int
+        Number of equations per chunk.
+
+    Yields
+    ------
+    index : int
+        Chunk number, counting from zero. Chunks are yielded as they finish, which is
+        not necessarily in order.
+    size : int
+        Number of equations in chunk.
+    totals : list[int]
+        Partial calibration result of chunk for each set of operators.
+    seconds : float
+        Time spent calibrating chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = enumerate(batched(calibrations, chunksize))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {
+            executor.submit(_calibrate_chunk, chunk, opsets): i
+            for i, chunk in islice(chunks, 2 * workers)
+        }
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                yield pending.pop(future), *future.result()
+
+            for i, chunk in islice(chunks, len(done)):
+                pending[executor.submit(_calibrate_chunk, chunk, opsets)] = i
+
+
+def _calibrate_chunk(
+    chunk: list[tuple[int, tuple[int, ...]]],
+    opsets: tuple[tuple[Callable[[int, int], int], ...], ...],
+) -> tuple[int, list[int], float]:
+    start = perf_counter()
+    totals = calibrate(chunk, *opsets)
+    return len(chunk), totals, perf_counter() - start
+
+
+def batched(iterable: Iterable, n: int) -> Iterator[list]:
+    it = iter(iterable)
+
+    while batch := list(islice(it, n)):
+        yield batch
+
+
+def read_calibrations(lines: Iterable[str]) -> Iterator[tuple[int, tuple[int, ...]]]:
+    for line in lines:
         tv, eq = line.strip().split(":")
-        calibrations.append((int(tv), tuple(map(int, eq.strip().split()))))
+        test_value, equation = int(tv), tuple(map(int, eq.strip().split()))
+
+        if test_value < 0 or min(equation) < 0:
+            raise ValueError(f"negative number in calibration: {line.strip()}")
+
+        yield test_value, equation
+
+
+def parse(buffer: bytes | mmap.mmap) -> list[tuple[int, tuple[int, ...]]]:
+    """Return the test value and numbers of each equation."""
+    return list(read_calibrations(bytes(buffer).decode().splitlines()))
+
+
+def solve(
+    calibrations: list[tuple[int, tuple[int, ...]]],
+    workers: Optional[int] = 0,
+    chunksize: int = 1000,
+) -> Iterator[int]:
+    """Yield the total calibration result with two operators, then with three.
+
+    Parameters
+    ----------
+    calibrations : list[tuple[int, tuple[int, ...]]]
+        Test values and equations.
+    workers : Optional[int]
+        Number of worker processes. If 0, equations are calibrated in this process.
+        If None, use one worker per CPU.
+    chunksize : int
+        Number of equations per worker task.
+    """
+    if workers == 0:
+        yield from calibrate(calibrations, ops1, ops2)
+        return
+
+    total1 = total2 = 0
+    chunks = calibrate_parallel(
+        calibrations, ops1, ops2, workers=workers, chunksize=chunksize
+    )
+
+    for _, _, (t1, t2), _ in chunks:
+        total1 += t1
+        total2 += t2
+
+    yield total1
+    yield total2
 
 
-valid = []
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes, 0 to run serially (default: one per CPU)",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunksize",
+        type=int,
+        default=1000,
+        help="number of equations per worker task (default: %(default)s)",
+    )
+    args = parser.parse_args()
 
-for test_value, equation in calibrations:
-    for combination in product(*(len(equation) - 1) * [ops2]):
-        out = equation[0]
+    with open("input.txt") as f:
+        calibrations = read_calibrations(f)
 
-        for i, op in zip(equation[1:], combination):
-            out = op(out, i)
+        if args.workers == 0:
+            total1, total2 = calibrate(calibrations, ops1, ops2)
+        else:
+            total1 = total2 = 0
+            chunks = calibrate_parallel(
+                calibrations,
+                ops1,
+                ops2,
+                workers=args.workers,
+                chunksize=args.chunksize,
+            )
 
-        if out == test_value:
-            valid.append(out)
-            break
+            for i, size, (t1, t2), seconds in chunks:
+                total1 += t1
+                total2 += t2
+                print(
+                    f"chunk {i}: {size} equations in {seconds:.3f} s", file=sys.stderr
+                )
 
-print("2:", sum(valid))
+    print("1:", total1)
+    print("2:", total2)
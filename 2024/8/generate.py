@@ -0,0 +1,51 @@
+"""Advent of Code 2024 - Day 8
+
+Author: Alexander Bessman
+
+Generate antenna maps of any size, with antennas of random frequencies at random
+locations.
+"""
+
+import math
+import random
+import string
+
+
+SIZE = 50 * 50
+
+FREQUENCIES = string.digits + string.ascii_letters
+
+
+def generate(
+    size: int,
+    seed: int = 0,
+    density: float = 0.08,
+    frequencies: int = 40,
+) -> bytes:
+    """Generate a square antenna map.
+
+    Parameters
+    ----------
+    size : int
+        Number of locations. The side of the square is rounded to the nearest
+        integer.
+    seed : int
+    density : float
+        Probability of each location holding an antenna.
+    frequencies : int
+        Number of distinct frequencies, at most 62.
+
+    Returns
+    -------
+    bytes
+    """
+    rng = random.Random(seed)
+    side = max(1, round(math.sqrt(size)))
+    choices = FREQUENCIES[:frequencies]
+    return b"".join(
+        "".join(
+            rng.choice(choices) if rng.random() < density else "." for _ in range(side)
+        ).encode()
+        + b"\n"
+        for _ in range(side)
+    )
@@ -1,47 +1,120 @@
-from itertools import permutations
+"""Advent of Code 2024 - Day 8
 
+Author: Alexander Bessman
 
-class Grid(complex):
-    def __contains__(self, other: complex) -> bool:
-        return (0 <= other.real < self.real) and (0 <= other.imag < self.imag)
+Antennas are grouped by frequency into arrays of coordinates. For each frequency, the
+differences between all pairs of antennas are computed at once, and the number of
+harmonics which fit inside the grid along each line is found directly, rather than by
+stepping until falling off the edge.
+"""
 
+import mmap
+from typing import Iterator
 
-def get_antinodes(
-    antenna_pair: tuple[complex, complex],
+import numpy as np
+import numpy.typing as npt
+
+from aoc.grid import Grid, char_view, map_file
+
+
+def group_antennas(
+    buffer: bytes | mmap.mmap,
+) -> tuple[Grid, list[npt.NDArray[np.intp]]]:
+    """Find the locations of all antennas, grouped by frequency.
+
+    Parameters
+    ----------
+    buffer : bytes | mmap.mmap
+        Puzzle input.
+
+    Returns
+    -------
+    grid : Grid
+        Antenna map.
+    antennas : list[NDArray[intp]]
+        One array of flat indices into 'grid' per frequency.
+    """
+    grid = Grid(char_view(buffer), fill=ord("."))
+    locations = np.flatnonzero(grid.cells != ord("."))
+    frequencies = grid.cells[locations]
+    order = np.argsort(frequencies, kind="stable")
+    splits = np.flatnonzero(np.diff(frequencies[order])) + 1
+    return grid, np.split(locations[order], splits)
+
+
+def mark_antinodes(
+    antennas: npt.NDArray[np.intp],
     grid: Grid,
-    harmonics: bool = True,
-) -> set[complex]:
-    diff = antenna_pair[0] - antenna_pair[1]
-    antinode = antenna_pair[0] + diff
-    antinodes: set[complex] = set()
+    near: npt.NDArray[np.bool_],
+    harmonics: npt.NDArray[np.bool_],
+    block: int = 2**18,
+) -> None:
+    """Mark the antinodes of antennas sharing one frequency.
+
+    Parameters
+    ----------
+    antennas : NDArray[intp]
+        Flat indices of antennas with the same frequency.
+    grid : Grid
+    near : NDArray[bool]
+        Flat mask on which to mark antinodes one step beyond each antenna (part 1).
+    harmonics : NDArray[bool]
+        Flat mask on which to mark all antinodes in line with each pair of antennas,
+        including the antennas themselves (part 2).
+    block : int
+        Number of antenna pairs to handle at once. The number of pairs grows with the
+        square of the number of antennas, so pairs are made a block of rows at a time
+        to keep memory use bounded.
+    """
+    n = len(antennas)
+
+    if n < 2:
+        return
+
+    coords = np.column_stack(grid.coords(antennas))
+    bounds = np.array(grid.shape)
+    rows = max(1, block // n)
+
+    for first in range(0, n, rows):
+        # Pairs of each antenna in this block of rows with every other antenna.
+        block_rows = np.arange(first, min(first + rows, n))
+        i, j = np.nonzero(block_rows[:, np.newaxis] != np.arange(n))
+        i += first
+        # Antinodes lie at start + k * step, for k = 0, 1, 2, ...
+        start = coords[i]
+        step = start - coords[j]
+        antinode = start + step
+        near[grid.index(*antinode[grid.contains(*antinode.T)].T)] = True
+        # Largest k which stays inside the grid, for each axis. Antennas of the same
+        # frequency never coincide, so at least one axis has a nonzero step.
+        room = np.where(step > 0, bounds - 1 - start, start)
+        last = np.where(step != 0, room // np.maximum(np.abs(step), 1), max(bounds))
+        counts = last.min(axis=1) + 1
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        flat_start = np.repeat(antennas[i], counts)
+        flat_step = np.repeat(antennas[i] - antennas[j], counts)
+        harmonics[flat_start + k * flat_step] = True
 
-    while antinode in grid:
-        antinodes.add(antinode)
-        antinode += diff
 
-        if not harmonics:
-            break
+def parse(buffer: bytes | mmap.mmap) -> tuple[Grid, list[npt.NDArray[np.intp]]]:
+    return group_antennas(buffer)
 
-    return antinodes | set(antenna_pair * harmonics)
 
+def solve(city: tuple[Grid, list[npt.NDArray[np.intp]]]) -> Iterator[int]:
+    """Yield the number of antinode locations without and with resonant harmonics."""
+    grid, antennas = city
+    near = np.zeros(grid.cells.size, dtype=bool)
+    harmonics = np.zeros(grid.cells.size, dtype=bool)
 
-with open("input.txt") as f:
-    antennas: dict[str, list[complex]] = {}
+    for frequency in antennas:
+        mark_antinodes(frequency, grid, near, harmonics)
 
-    for row, line in enumerate(f.read().split("\n")):
-        for col, char in enumerate(line):
-            if char == ".":
-                continue
-            antennas[char] = antennas.get(char, []) + [col + row * 1j]
+    yield int(np.count_nonzero(near))
+    yield int(np.count_nonzero(harmonics))
 
-grid = Grid(col + 1 + row * 1j)
-antinodes_1: set[complex] = set()
-antinodes_2: set[complex] = set()
 
-for antenna_type in antennas.values():
-    for antenna_pair in permutations(antenna_type, 2):
-        antinodes_1 |= get_antinodes(antenna_pair, grid, harmonics=False)
-        antinodes_2 |= get_antinodes(antenna_pair, grid, harmonics=True)
+if __name__ == "__main__":
+    city = parse(map_file("input.txt"))
 
-print("1:", len(antinodes_1))
-print("2:", len(antinodes_2))
+    for part, answer in enumerate(solve(city), 1):
+        print(f"{part}:", answer)
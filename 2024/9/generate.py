@@ -0,0 +1,34 @@
+"""Advent of Code 2024 - Day 9
+
+Author: Alexander Bessman
+
+Generate disk maps with any number of files.
+"""
+
+import random
+
+
+SIZE = 10000
+
+
+def generate(size: int, seed: int = 0) -> bytes:
+    """Generate a disk map.
+
+    Parameters
+    ----------
+    size : int
+        Number of files.
+    seed : int
+
+    Returns
+    -------
+    bytes
+        Alternating file sizes (1-9) and gap sizes (0-9), starting and ending with a
+        file.
+    """
+    rng = random.Random(seed)
+    digits = [
+        str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9))
+        for i in range(max(1, 2 * size - 1))
+    ]
+    return ("".join(digits) + "\n").encode()
@@ -1,99 +1,178 @@
 """Advent of Code - Day 9
 
 Author: Alexander Bessman
+
+Files are never expanded into individual blocks. Both parts work on runs of blocks
+belonging to the same file, and the checksum of each run is calculated directly.
 """
 
-from dataclasses import dataclass
+import mmap
+from array import array
+from heapq import heapify, heappop, heappush
+from itertools import accumulate
+from typing import Iterator, Optional, Sequence
+
+
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
 
+def checksum(id: int, address: int, size: int) -> int:
+    """Return sum(id * (address + i) for i in range(size))."""
+    return id * (size * address + size * (size - 1) // 2)
 
-def fragment(filesystem: list[int]):
+
+def fragment(filesystem: Sequence[int]) -> Iterator[tuple[int, int]]:
     """Generate a fragmented filesystem representation.
 
     This function does not actually move any files around; it only calculates the
     representation that would result if the files were fragmented and moved.
+
+    Parameters
+    ----------
+    filesystem : Sequence[int]
+        Disk map.
+
+    Yields
+    ------
+    id : int
+        File id.
+    size : int
+        Number of consecutive blocks belonging to file.
     """
-    frag = filesystem[:]
-    tail_id = 0
-    tail_size = 0
+    tail = len(filesystem) - 1 - (len(filesystem) + 1) % 2  # Index of last file.
+    tail_size = filesystem[tail]
+    i = 0
 
-    for i, b in enumerate(frag):
+    while i < tail:
         if i % 2:  # Empty memory block.
-            while b:
-                if not tail_size:
-                    tail_size = frag.pop()
-                    frag.pop()
-                    tail_id = len(frag) // 2 + 1
+            gap = filesystem[i]
+
+            while gap and i < tail:
+                size = min(gap, tail_size)
+                yield tail // 2, size
+                gap -= size
+                tail_size -= size
 
-                yield tail_id
-                b -= 1
-                tail_size -= 1
+                if not tail_size:
+                    tail -= 2
+                    tail_size = filesystem[tail]
         else:  # File block.
-            while b:
-                yield i // 2
-                b -= 1
+            yield i // 2, filesystem[i]
+
+        i += 1
+
+    if i == tail:
+        yield tail // 2, tail_size
+
+
+class FreeSpace:
+    """Free memory blocks, indexed by size.
+
+    Gaps are kept in one min-heap of addresses per gap size, so the leftmost gap which
+    fits a file is found by looking at the top of each heap which is large enough.
+    """
 
-    while tail_size:
-        yield tail_id
-        tail_size -= 1
+    def __init__(self, addresses: Sequence[int], sizes: Sequence[int]) -> None:
+        self.heaps: list[list[int]] = [[] for _ in range(max(sizes, default=0) + 1)]
 
+        for address, size in zip(addresses, sizes):
+            if size:
+                self.heaps[size].append(address)
 
-@dataclass
-class File:
-    id: int
-    address: int
-    size: int
+        for heap in self.heaps:
+            heapify(heap)
+
+    def allocate(self, size: int, before: int) -> Optional[int]:
+        """Take 'size' blocks from the leftmost gap which fits.
+
+        Parameters
+        ----------
+        size : int
+            Number of blocks to allocate.
+        before : int
+            Only gaps at lower addresses than this are considered.
+
+        Returns
+        -------
+        Optional[int]
+            Address of allocated blocks, or None if no gap fits.
+        """
+        if not size:
+            return None
+
+        best = None
+
+        for s in range(size, len(self.heaps)):
+            heap = self.heaps[s]
+
+            if heap and heap[0] < before:
+                if best is None or heap[0] < self.heaps[best][0]:
+                    best = s
+
+        if best is None:
+            return None
+
+        address = heappop(self.heaps[best])
+
+        if best > size:
+            # Re-index what is left of the gap.
+            heappush(self.heaps[best - size], address + size)
+
+        return address
 
 
 class Filesystem:
-    def __init__(self, filesystem: list[int]) -> None:
-        self.files = []
-        self.empty = []
-        address = 0
+    """Files and free space.
 
-        for i, (f, e) in enumerate(zip(filesystem[::2], filesystem[1::2])):
-            self.files.append(File(i, address, f))
-            address += f
-            self.empty.append(File(-1, address, e))
-            address += e
+    Files are stored as parallel arrays of addresses and sizes, indexed by file id.
+    """
 
-        self.files.append(File(i + 1, address, filesystem[-1]))
+    def __init__(self, filesystem: Sequence[int]) -> None:
+        n = len(filesystem)
+        addresses = array("q", accumulate(filesystem, initial=0))
+        self.addresses = addresses[0:n:2]
+        self.sizes = array("B", filesystem[0:n:2])
+        self.free = FreeSpace(addresses[1:n:2], filesystem[1:n:2])
 
     def compact(self):
         """Free up space by moving files to lower addresses when possible."""
-        previous_id = self.files[-1].id + 1
+        for id in reversed(range(len(self.sizes))):
+            address = self.free.allocate(self.sizes[id], before=self.addresses[id])
+
+            if address is not None:
+                self.addresses[id] = address
+
+    def checksum(self) -> int:
+        return sum(
+            checksum(id, address, size)
+            for id, (address, size) in enumerate(zip(self.addresses, self.sizes))
+        )
+
 
-        for f in self.files[::-1]:
-            if f.id > previous_id:
-                # Don't move a file which has already been moved.
-                continue
+def parse(buffer: bytes | mmap.mmap) -> bytes:
+    """Return the disk map, with one byte per digit."""
+    return bytes(buffer).strip().translate(DIGITS)
 
-            for e in self.empty:
-                if e.address > f.address:
-                    # Don't move file to the right.
-                    break
 
-                if f.size <= e.size:
-                    f.address = e.address
-                    e.size -= f.size
-                    e.address += f.size
-                    break
+def solve(fs: bytes) -> Iterator[int]:
+    """Yield the checksum after fragmenting, then after compacting whole files."""
+    total = 0
+    address = 0
 
-            previous_id = f.id
+    for id, size in fragment(fs):
+        total += checksum(id, address, size)
+        address += size
 
+    yield total
 
-# %% Load input
-with open("input.txt") as f:
-    fs = [int(i) for i in f.read().strip()]
+    filesys = Filesystem(fs)
+    filesys.compact()
+    yield filesys.checksum()
 
 
-# %% Part 1
-_1 = sum(i * b for i, b in enumerate(fragment(fs)))
-# %%
-print("1:", _1)
+if __name__ == "__main__":
+    with open("input.txt", "rb") as f:
+        fs = parse(f.read())
 
-# %% Part 2
-filesys = Filesystem(fs)
-filesys.compact()
-_2 = sum(f.id * (f.address + i) for f in filesys.files for i in range(f.size))
-# %%
-print("2:", _2)
+    for part, answer in enumerate(solve(fs), 1):
+        print(f"{part}:", answer)
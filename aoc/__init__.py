@@ -0,0 +1,114 @@
+"""Advent of Code solutions, importable.
+
+Author: Alexander Bessman
+
+Each solution lives in <year>/<day>/main.py and exposes two functions:
+
+parse(buffer: bytes | mmap.mmap)
+    Convert the puzzle input to whatever the solution works on. The runner passes a
+    memory-mapped file, so that grids can be viewed without reading the whole input.
+solve(parsed) -> Iterator
+    Yield the answers to part 1 and part 2, in that order. The generator can be
+    unpacked directly, as in ``part1, part2 = solve(parsed)``.
+
+Solutions may import from this package, so run them with the repository on the path,
+either through `aoc.load` and ``python -m aoc``, or from the day's directory as
+``PYTHONPATH=../.. python main.py``.
+
+Next to it, <year>/<day>/generate.py makes inputs of any size:
+
+SIZE
+    Size of a typical puzzle input, in whatever unit 'generate' takes.
+generate(size: int, seed: int = 0, **options) -> bytes
+    Return a valid puzzle input of roughly 'size' elements (lines, cells, files...),
+    reproducibly for a given 'seed'.
+SCALE (optional)
+    Names of options which `aoc.scaling` should scale besides 'size', because the
+    solution's running time depends on them more than on the number of elements.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def source(year: int, day: int, name: str = "main") -> Path:
+    """Return the path of a day's solution, or of another module next to it."""
+    return ROOT / str(year) / str(day) / f"{name}.py"
+
+
+def days(year: int) -> list[int]:
+    """Return all days of 'year' which have a solution, in order."""
+    return sorted(
+        int(path.parent.name)
+        for path in (ROOT / str(year)).glob("*/main.py")
+        if path.parent.name.isdigit()
+    )
+
+
+def load(year: int, day: int, name: str = "main") -> ModuleType:
+    """Import a day's solution, or return it if it is already imported.
+
+    The module is registered in sys.modules under the name aoc_<year>_<day>, so that
+    functions defined in it can be sent to worker processes. Other modules next to
+    the solution, such as its input generator, are registered as
+    aoc_<year>_<day>_<name>.
+
+    Parameters
+    ----------
+    year : int
+    day : int
+    name : str
+        Module to load from the day's directory.
+
+    Returns
+    -------
+    ModuleType
+
+    Raises
+    ------
+    FileNotFoundError
+        If there is no such module for this day.
+    """
+    path = source(year, day, name)
+    name = f"aoc_{year}_{day}" + ("" if name == "main" else f"_{name}")
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if not path.exists():
+        raise FileNotFoundError(f"nothing to load for {year} day {day}: {path}")
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+
+    return module
+
+
+def run(year: int, day: int, buffer: bytes) -> tuple:
+    """Parse and solve one puzzle input.
+
+    Parameters
+    ----------
+    year : int
+    day : int
+    buffer : bytes
+        Puzzle input.
+
+    Returns
+    -------
+    part1, part2 : tuple
+    """
+    module = load(year, day)
+    return tuple(module.solve(module.parse(buffer)))
@@ -0,0 +1,130 @@
+"""Run any number of solutions on any number of inputs, in a single process.
+
+Usage: python -m aoc 2024 6 --input path/to/input.txt
+
+Input paths may contain {year} and {day}, which are replaced for each day. By default,
+each day is run on <year>/<day>/input.txt in the repository.
+
+Errors are reported on stderr, one line per failed day or input, and the remaining
+inputs are still run. The exit status is 1 if anything failed.
+
+With --cache, answers are looked up in the cache of `aoc.cache` before solving, and the
+parsed input is reused when only the answers are missing.
+"""
+
+import argparse
+import mmap
+import sys
+from pathlib import Path
+from time import perf_counter
+from types import ModuleType
+
+from aoc import ROOT, days, load
+from aoc.cache import MISSING, Cache
+from aoc.grid import map_file
+
+
+def _solve_cached(
+    cache: Cache, year: int, day: int, module: ModuleType, buffer: bytes | mmap.mmap
+) -> tuple[tuple, str]:
+    key = cache.key(year, day, buffer)
+    answers = cache.answers(key)
+
+    if answers is not None:
+        return answers, ", cached"
+
+    parsed = cache.parsed(key)
+    note = ", cached parse"
+
+    if parsed is MISSING:
+        parsed = module.parse(buffer)
+        cache.store_parsed(key, year, day, parsed)
+        note = ""
+
+    answers = tuple(module.solve(parsed))
+    cache.store_answers(key, year, day, answers)
+    return answers, note
+
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    parser.add_argument("year", type=int)
+    parser.add_argument(
+        "days",
+        type=int,
+        nargs="*",
+        help="days to run (default: all days with a solution)",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        nargs="+",
+        default=[str(ROOT / "{year}" / "{day}" / "input.txt")],
+        help="input files to run each day on (default: <year>/<day>/input.txt)",
+    )
+    parser.add_argument(
+        "-c",
+        "--cache",
+        action="store_true",
+        help="reuse cached answers and parsed inputs, and cache new ones",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="cache directory (default: $AOC_CACHE_DIR, or ~/.cache/aoc)",
+    )
+    args = parser.parse_args(argv)
+    cache = Cache(args.cache_dir) if args.cache else None
+    failed = 0
+
+    for day in args.days or days(args.year):
+        try:
+            module = load(args.year, day)
+        except Exception as e:
+            print(f"{args.year} day {day}: {_describe(e)}", file=sys.stderr)
+            failed += 1
+            continue
+
+        for template in args.input:
+            path = template.format(year=args.year, day=day)
+
+            try:
+                buffer = map_file(path)
+            except OSError as e:
+                print(f"{args.year} day {day} {path}: {_describe(e)}", file=sys.stderr)
+                failed += 1
+                continue
+
+            start = perf_counter()
+
+            # One bad input should not stop a batch of hundreds, so any error in the
+            # solution is reported, and the batch carries on with the next input.
+            try:
+                if cache is None:
+                    part1, part2 = module.solve(module.parse(buffer))
+                    note = ""
+                else:
+                    (part1, part2), note = _solve_cached(
+                        cache, args.year, day, module, buffer
+                    )
+            except Exception as e:
+                print(f"{args.year} day {day} {path}: {_describe(e)}", file=sys.stderr)
+                failed += 1
+                continue
+
+            seconds = perf_counter() - start
+            print(
+                f"{args.year} day {day} {path}: 1: {part1} 2: {part2} "
+                f"({seconds:.3f} s{note})"
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Benchmark the parse, part 1 and part 2 phases of each day.
+
+Usage: python -m aoc.bench 2024 [DAY ...] [--save baseline.json]
+       python -m aoc.bench 2024 [DAY ...] [--compare baseline.json]
+
+Phases are timed by stepping through solve(), so part 1 includes any work shared by
+both parts, and days which find both answers in one pass have a near-zero part 2. Each
+day is run a few times to warm up, then timed over several repeats. The median and
+interquartile range of each phase are reported, and can be saved as a JSON baseline.
+When comparing against a baseline, the exit status is 1 if any phase is slower than
+the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from time import perf_counter
+from types import ModuleType
+
+from aoc import ROOT, days, load
+
+
+PHASES = ("parse", "part1", "part2")
+
+
+def time_phases(
+    module: ModuleType,
+    buffer: bytes,
+    repeat: int = 5,
+    warmup: int = 1,
+) -> dict[str, list[float]]:
+    """Time each phase of a day's solution.
+
+    Parameters
+    ----------
+    module : ModuleType
+        Day's solution, as returned by `aoc.load`.
+    buffer : bytes
+        Puzzle input.
+    repeat : int
+        Number of timed runs.
+    warmup : int
+        Number of untimed runs before the timed ones.
+
+    Returns
+    -------
+    dict[str, list[float]]
+        Seconds spent in each phase, one sample per timed run.
+    """
+    samples: dict[str, list[float]] = {phase: [] for phase in PHASES}
+
+    for i in range(warmup + repeat):
+        start = perf_counter()
+        parsed = module.parse(buffer)
+        parsed_at = perf_counter()
+        answers = module.solve(parsed)
+        next(answers)
+        part1_at = perf_counter()
+        next(answers)
+        end = perf_counter()
+
+        if i >= warmup:
+            samples["parse"].append(parsed_at - start)
+            samples["part1"].append(part1_at - parsed_at)
+            samples["part2"].append(end - part1_at)
+
+    return samples
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return the median and interquartile range of 'samples'."""
+    if len(samples) < 2:
+        return {"median": samples[0], "iqr": 0.0}
+
+    q1, median, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    return {"median": median, "iqr": q3 - q1}
+
+
+def compare(
+    results: dict[str, dict[str, dict[str, float]]],
+    baseline: dict[str, dict[str, dict[str, float]]],
+    threshold: float = 0.1,
+    floor: float = 1e-3,
+) -> list[tuple[str, str, float, float]]:
+    """Find phases which are slower than the baseline.
+
+    Parameters
+    ----------
+    results, baseline : dict[str, dict[str, dict[str, float]]]
+        Summaries of each phase of each day, as produced by `summarize`.
+    threshold : float
+        Allowed slowdown, as a fraction of the baseline median.
+    floor : float
+        Allowed slowdown in seconds, regardless of 'threshold'. Keeps very fast
+        phases from being flagged because of timer noise.
+
+    Returns
+    -------
+    list[tuple[str, str, float, float]]
+        Day, phase, baseline median and new median of each regression.
+    """
+    regressions = []
+
+    for day, phases in results.items():
+        for phase, summary in phases.items():
+            try:
+                old = baseline[day][phase]["median"]
+            except KeyError:
+                continue
+
+            new = summary["median"]
+
+            if new - old > max(threshold * old, floor):
+                regressions.append((day, phase, old, new))
+
+    return regressions
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+
+    return f"{seconds * 1e3:.3f} ms"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.bench")
+    parser.add_argument("year", type=int)
+    parser.add_argument(
+        "days",
+        type=int,
+        nargs="*",
+        help="days to benchmark (default: all days with a solution)",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        default=str(ROOT / "{year}" / "{day}" / "input.txt"),
+        help="input file, may contain {year} and {day} (default: "
+        "<year>/<day>/input.txt)",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=5,
+        help="number of timed runs per day (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-w",
+        "--warmup",
+        type=int,
+        default=1,
+        help="number of untimed runs per day (default: %(default)s)",
+    )
+    parser.add_argument("--save", metavar="FILE", help="save results as a baseline")
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="compare results against a baseline, and exit with status 1 on "
+        "regressions",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown relative to the baseline (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--floor",
+        type=float,
+        default=1e-3,
+        help="allowed slowdown in seconds, for very fast phases (default: "
+        "%(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = {}
+
+    if args.compare:
+        with open(args.compare) as f:
+            saved = json.load(f)
+
+        if saved["year"] != args.year:
+            parser.error(f"{args.compare} is a baseline for {saved['year']}")
+
+        baseline = saved["days"]
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    print(f"{'day':>4} {'phase':<6} {'median':>12} {'iqr':>12} {'baseline':>12}")
+
+    for day in args.days or days(args.year):
+        path = args.input.format(year=args.year, day=day)
+
+        try:
+            with open(path, "rb") as f:
+                buffer = f.read()
+        except OSError as e:
+            print(f"{args.year} day {day}: skipped, {e}", file=sys.stderr)
+            continue
+
+        samples = time_phases(load(args.year, day), buffer, args.repeat, args.warmup)
+        results[str(day)] = {phase: summarize(samples[phase]) for phase in PHASES}
+
+        for phase, summary in results[str(day)].items():
+            old = baseline.get(str(day), {}).get(phase)
+            print(
+                f"{day:>4} {phase:<6} {_format_seconds(summary['median']):>12} "
+                f"{_format_seconds(summary['iqr']):>12} "
+                f"{_format_seconds(old['median']) if old else '-':>12}"
+            )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"year": args.year, "repeat": args.repeat, "days": results},
+                f,
+                indent=2,
+            )
+
+    regressions = compare(results, baseline, args.threshold, args.floor)
+
+    for day, phase, old, new in regressions:
+        print(
+            f"day {day} {phase} regressed: {_format_seconds(old)} -> "
+            f"{_format_seconds(new)}" + (f" ({new / old - 1:+.0%})" if old else ""),
+            file=sys.stderr,
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""Content-addressed cache of parsed inputs and answers.
+
+Author: Alexander Bessman
+
+Entries are keyed by a hash of the puzzle input together with the source of the day's
+solution and of this package, so that editing either makes old entries unreachable.
+Each entry is a directory holding the answers as JSON and the parsed input as a
+pickle. NumPy arrays in the parsed input are stored next to the pickle as .npy files,
+and memory-mapped when loaded, so large grids are not read until they are used.
+
+The cache is capped in size. When it grows beyond the cap, the least recently used
+entries are removed.
+
+Usage: python -m aoc.cache info
+       python -m aoc.cache invalidate [YEAR [DAY]]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from aoc import ROOT, source
+
+
+MISSING = object()
+
+
+def default_root() -> Path:
+    """Return $AOC_CACHE_DIR, or $XDG_CACHE_HOME/aoc, or ~/.cache/aoc."""
+    if "AOC_CACHE_DIR" in os.environ:
+        return Path(os.environ["AOC_CACHE_DIR"])
+
+    xdg = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg) / "aoc"
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler which stores large arrays in separate .npy files."""
+
+    def __init__(self, file: io.BufferedIOBase, directory: Path, threshold: int):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory
+        self.threshold = threshold
+        self.arrays = 0
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        if (
+            isinstance(obj, np.ndarray)
+            and obj.nbytes >= self.threshold
+            and not obj.dtype.hasobject
+        ):
+            name = f"array{self.arrays}.npy"
+            np.save(self.directory / name, obj, allow_pickle=False)
+            self.arrays += 1
+            return name
+
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: io.BufferedIOBase, directory: Path):
+        super().__init__(file)
+        self.directory = directory
+
+    def persistent_load(self, pid: str) -> np.ndarray:
+        return np.load(self.directory / pid, mmap_mode="r")
+
+
+class Cache:
+    """Cache of parsed inputs and answers, on local disk.
+
+    Parameters
+    ----------
+    root : Optional[Path]
+        Cache directory. Defaults to `default_root()`.
+    max_bytes : int
+        Size cap, in bytes.
+    threshold : int
+        Arrays at least this large are stored as .npy files and memory-mapped when
+        loaded. Smaller arrays are pickled along with the rest of the parsed input.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_bytes: int = 2**30,
+        threshold: int = 2**16,
+    ) -> None:
+        self.root = Path(root) if root is not None else default_root()
+        self.max_bytes = max_bytes
+        self.threshold = threshold
+
+    def key(self, year: int, day: int, buffer: bytes | mmap.mmap) -> str:
+        """Return the key of a puzzle input for a day's solution."""
+        digest = hashlib.sha256(f"{year}/{day}\n".encode())
+
+        for path in [source(year, day), *sorted((ROOT / "aoc").glob("*.py"))]:
+            digest.update(path.read_bytes())
+
+        digest.update(buffer)
+        return digest.hexdigest()
+
+    def answers(self, key: str) -> Optional[tuple]:
+        """Return cached answers, or None."""
+        try:
+            answers = json.loads((self.root / key / "answers.json").read_text())
+        except FileNotFoundError:
+            return None
+
+        self._touch(key)
+        return tuple(answers)
+
+    def parsed(self, key: str) -> Any:
+        """Return a cached parsed input, or MISSING."""
+        entry = self.root / key
+
+        try:
+            with open(entry / "parsed.pickle", "rb") as f:
+                parsed = _Unpickler(f, entry).load()
+        except FileNotFoundError:
+            return MISSING
+
+        self._touch(key)
+        return parsed
+
+    def store_answers(self, key: str, year: int, day: int, answers: tuple) -> None:
+        entry = self._entry(key, year, day)
+        # Answers may be NumPy scalars, which JSON only knows as Python numbers.
+        text = json.dumps(list(answers), default=lambda a: a.item())
+        self._write(entry / "answers.json", text.encode())
+        self.evict()
+
+    def store_parsed(self, key: str, year: int, day: int, parsed: Any) -> None:
+        entry = self._entry(key, year, day)
+        buffer = io.BytesIO()
+        # Arrays are written first, so that the pickle only exists once its arrays do.
+        _Pickler(buffer, entry, self.threshold).dump(parsed)
+        self._write(entry / "parsed.pickle", buffer.getvalue())
+        self.evict()
+
+    def entries(self) -> list[tuple[str, dict, int, float]]:
+        """List cache entries, least recently used first.
+
+        Returns
+        -------
+        list[tuple[str, dict, int, float]]
+            Key, metadata (year and day), size in bytes, and time of last use of each
+            entry.
+        """
+        entries = []
+
+        if not self.root.is_dir():
+            return entries
+
+        for entry in self.root.iterdir():
+            try:
+                meta = json.loads((entry / "meta.json").read_text())
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                used = entry.stat().st_mtime
+            except (FileNotFoundError, NotADirectoryError):
+                continue  # Incomplete, or removed while listing.
+
+            entries.append((entry.name, meta, size, used))
+
+        return sorted(entries, key=lambda e: e[3])
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits its cap.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        entries = self.entries()
+        total = sum(size for _, _, size, _ in entries)
+        removed = 0
+
+        for key, _, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+
+            shutil.rmtree(self.root / key, ignore_errors=True)
+            total -= size
+            removed += 1
+
+        return removed
+
+    def invalidate(self, year: Optional[int] = None, day: Optional[int] = None) -> int:
+        """Remove all entries, or only those of one year or day.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        removed = 0
+
+        for key, meta, _, _ in self.entries():
+            if year is not None and meta["year"] != year:
+                continue
+
+            if day is not None and meta["day"] != day:
+                continue
+
+            shutil.rmtree(self.root / key, ignore_errors=True)
+            removed += 1
+
+        return removed
+
+    def _entry(self, key: str, year: int, day: int) -> Path:
+        entry = self.root / key
+        entry.mkdir(parents=True, exist_ok=True)
+
+        if not (entry / "meta.json").exists():
+            meta = {"year": year, "day": day}
+            self._write(entry / "meta.json", json.dumps(meta).encode())
+
+        return entry
+
+    def _touch(self, key: str) -> None:
+        # The entry directory's modification time doubles as its time of last use.
+        try:
+            os.utime(self.root / key)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        # Write to a temporary file and rename it, so that readers never see a
+        # partially written file.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        os.replace(tmp, path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.cache")
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=None,
+        help="cache directory (default: $AOC_CACHE_DIR, or ~/.cache/aoc)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("info", help="list cache entries")
+    invalidate = commands.add_parser("invalidate", help="remove cache entries")
+    invalidate.add_argument("year", type=int, nargs="?")
+    invalidate.add_argument("day", type=int, nargs="?")
+    args = parser.parse_args(argv)
+
+    cache = Cache(args.dir)
+
+    if args.command == "info":
+        entries = cache.entries()
+
+        for key, meta, size, _ in entries:
+            print(f"{meta['year']} day {meta['day']:>2}  {size:>12}  {key}")
+
+        total = sum(size for _, _, size, _ in entries)
+        print(f"{len(entries)} entries, {total} bytes, in {cache.root}")
+    else:
+        removed = cache.invalidate(args.year, args.day)
+        print(f"removed {removed} entries from {cache.root}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Write a generated puzzle input to stdout.
+
+Usage: python -m aoc.generate 2024 6 [--size N] [--seed N] [-o density=0.1 ...]
+
+Options given with -o are passed to the day's generate() as keyword arguments, with
+values parsed as Python literals.
+"""
+
+import argparse
+import ast
+import sys
+
+from aoc import load
+
+
+def _option(text: str) -> tuple[str, object]:
+    key, sep, value = text.partition("=")
+
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected key=value, got {text!r}")
+
+    try:
+        return key, ast.literal_eval(value)
+    except (SyntaxError, ValueError):
+        return key, value
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.generate")
+    parser.add_argument("year", type=int)
+    parser.add_argument("day", type=int)
+    parser.add_argument(
+        "-n",
+        "--size",
+        type=int,
+        help="input size, in the unit of the day's generate() (default: its SIZE)",
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument(
+        "-o",
+        "--option",
+        type=_option,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="keyword argument for the day's generate()",
+    )
+    args = parser.parse_args(argv)
+
+    generator = load(args.year, args.day, "generate")
+    size = generator.SIZE if args.size is None else args.size
+    sys.stdout.buffer.write(
+        generator.generate(size, seed=args.seed, **dict(args.option))
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Flat-index grids.
+
+Author: Alexander Bessman
+
+A grid is stored as one contiguous NumPy array, padded with a border of fill cells.
+Cells are addressed by their flat index into the padded array, so that moving in a
+direction is adding a fixed offset, and stepping off the edge lands on the border
+instead of needing a bounds check.
+
+Character grids are parsed without copying: the input is viewed as a 2D array of bytes,
+with the newlines at the end of each row skipped by the row stride. Only mapping the
+characters to values (see `lookup`) makes a copy.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from typing import Mapping
+
+import numpy as np
+import numpy.typing as npt
+
+UP, RIGHT, DOWN, LEFT = range(4)
+
+# Direction lookup tables, indexed by direction.
+TURN_RIGHT = (RIGHT, DOWN, LEFT, UP)
+TURN_LEFT = (LEFT, UP, RIGHT, DOWN)
+DELTAS = ((-1, 0), (0, 1), (1, 0), (0, -1))  # (drow, dcol)
+ARROWS = "^>v<"
+
+
+class Grid:
+    """Two-dimensional grid, padded and flattened.
+
+    Parameters
+    ----------
+    cells : NDArray
+        Two-dimensional array of cell values.
+    fill : optional
+        Value of the border cells.
+    pad : int
+        Width of the border.
+    """
+
+    def __init__(self, cells: npt.NDArray, fill=0, pad: int = 1) -> None:
+        self.shape: tuple[int, int] = cells.shape
+        self.pad = pad
+        padded = np.pad(cells, pad, constant_values=fill)
+        self.width: int = padded.shape[1]
+        self.cells = padded.ravel()
+        # Change in flat index for one step in each direction.
+        self.offsets: tuple[int, ...] = tuple(
+            drow * self.width + dcol for drow, dcol in DELTAS
+        )
+
+    @property
+    def padded(self) -> npt.NDArray:
+        """Two-dimensional view of the padded grid."""
+        return self.cells.reshape(-1, self.width)
+
+    @property
+    def interior(self) -> npt.NDArray:
+        """Two-dimensional view of the grid without its border."""
+        return self.shifted(0, 0)
+
+    def shifted(self, drow: int, dcol: int) -> npt.NDArray:
+        """View of the grid, shifted so that each cell lines up with its neighbour.
+
+        Element (row, col) of the returned view is the cell at (row + drow, col + dcol).
+        Shifts may not exceed the width of the border.
+        """
+        height, width = self.shape
+        row, col = self.pad + drow, self.pad + dcol
+        return self.padded[row : row + height, col : col + width]
+
+    def index(self, row, col):
+        """Convert unpadded coordinates to flat indices. Works on arrays too."""
+        return (row + self.pad) * self.width + col + self.pad
+
+    def coords(self, index):
+        """Convert flat indices to unpadded coordinates. Works on arrays too."""
+        row, col = np.divmod(index, self.width)
+        return row - self.pad, col - self.pad
+
+    def find(self, value) -> npt.NDArray[np.intp]:
+        """Return flat indices of all cells equal to 'value'."""
+        return np.flatnonzero(self.cells == value)
+
+    def neighbours(self, index: npt.NDArray[np.integer]) -> npt.NDArray[np.integer]:
+        """Return flat indices of the four neighbours of each index.
+
+        Neighbours are along a new last axis, in the order up, right, down, left. They
+        have the same integer type as 'index'.
+        """
+        index = np.asarray(index)
+        return index[..., np.newaxis] + np.array(self.offsets, dtype=index.dtype)
+
+    def contains(self, row, col):
+        """Check if unpadded coordinates are on the grid. Works on arrays too."""
+        return (0 <= row) & (row < self.shape[0]) & (0 <= col) & (col < self.shape[1])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shape={self.shape}, pad={self.pad})"
+
+
+def map_file(path: str | os.PathLike) -> mmap.mmap | bytes:
+    """Memory-map a file for reading.
+
+    The mapping stays open for as long as any array viewing it exists.
+    """
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return b""  # Empty files cannot be mapped.
+
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def char_view(buffer: bytes | mmap.mmap) -> npt.NDArray[np.uint8]:
+    """View lines of equal length as a read-only 2D array of characters, without copying.
+
+    Parameters
+    ----------
+    buffer : bytes | mmap.mmap
+        Lines separated by newlines. Trailing newlines are ignored.
+
+    Returns
+    -------
+    NDArray[uint8]
+        One row per line, without the newlines.
+
+    Raises
+    ------
+    ValueError
+        If the lines are not all of the same length.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    size = len(data)
+
+    while size and data[size - 1] == ord("\n"):
+        size -= 1
+
+    width = buffer.find(b"\n", 0, size)
+    width = size if width < 0 else width
+    stride = width + 1
+    height = size // stride + 1 if size else 0
+
+    if height and (
+        (height - 1) * stride + width != size
+        or not (data[width:size:stride] == ord("\n")).all()
+    ):
+        raise ValueError("lines are not all of the same length")
+
+    return np.lib.stride_tricks.as_strided(
+        data, shape=(height, width), strides=(stride, 1), writeable=False
+    )
+
+
+def lookup(
+    chars: npt.NDArray[np.uint8],
+    table: Mapping[str, int] | npt.NDArray,
+    default: int = 0,
+    dtype: npt.DTypeLike = np.uint8,
+) -> npt.NDArray:
+    """Map each character to a value.
+
+    Parameters
+    ----------
+    chars : NDArray[uint8]
+        Characters, as returned by `char_view`.
+    table : Mapping[str, int] | NDArray
+        Value of each character, either as a mapping or as an array of 256 values
+        indexed by character code.
+    default : int
+        Value of characters missing from a mapping.
+    dtype : DTypeLike
+        Type of the values, when 'table' is a mapping.
+
+    Returns
+    -------
+    NDArray
+        Same shape as 'chars'.
+    """
+    if isinstance(table, Mapping) and len(table) < 3:
+        # Gathering from a table costs several comparisons, so map just a few
+        # characters by comparing.
+        values = np.full(chars.shape, default, dtype=dtype)
+
+        for char, value in table.items():
+            np.copyto(values, value, where=chars == ord(char))
+
+        return values
+
+    if isinstance(table, Mapping):
+        mapping = table
+        table = np.full(256, default, dtype=dtype)
+
+        for char, value in mapping.items():
+            table[ord(char)] = value
+
+    return table[chars]
+
+
+def locate(
+    chars: npt.NDArray[np.uint8],
+    targets: str,
+) -> dict[str, tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]]:
+    """Find the rows and columns of every occurrence of each target character.
+
+    Parameters
+    ----------
+    chars : NDArray[uint8]
+        Characters, as returned by `char_view`.
+    targets : str
+        Characters to look for.
+
+    Returns
+    -------
+    dict[str, tuple[NDArray[intp], NDArray[intp]]]
+        Row and column coordinate arrays, for each target character.
+    """
+    return {c: np.nonzero(chars == ord(c)) for c in targets}
@@ -0,0 +1,239 @@
+"""Measure how each day's solution scales with the size of its input.
+
+Usage: python -m aoc.scaling 2024 [DAY ...] [--steps 5] [-o KEY=VALUE ...]
+       python -m aoc.scaling 2024 7 --scale length
+
+Each day is run on generated inputs of 1x, 2x, 4x, ... its typical puzzle size, and
+the parse, part 1 and part 2 phases are timed as by `aoc.bench`. The scaling exponent
+of each phase is the slope of a least squares fit of log(time) against log(input
+bytes), so 1 means linear time and 2 quadratic.
+
+Instead of the size, any numeric option of the day's generator can be scaled with
+--scale, such as the length of day 7's equations. Without --scale, the options listed
+in the generator's SCALE are scaled too, each in its own table, after the size. Options
+given with -o are passed to the generator as by `aoc.generate`, and give the 1x value
+of a scaled option. The exponent of a scaled option is fitted against its value rather
+than against input bytes.
+"""
+
+import argparse
+import inspect
+import math
+import statistics
+import sys
+from typing import Any, Optional, Sequence
+
+from aoc import days, load
+from aoc.bench import PHASES, _format_seconds, time_phases
+from aoc.generate import _option
+
+
+def fit_exponent(sizes: Sequence[float], seconds: Sequence[float]) -> float:
+    """Fit seconds = c * sizes**k, and return k."""
+    x = [math.log(s) for s in sizes]
+    y = [math.log(max(t, 1e-9)) for t in seconds]
+    return statistics.linear_regression(x, y).slope
+
+
+def scaled(value: Any, factor: float) -> Any:
+    """Multiply a number, or each number in a tuple or list, keeping ints ints."""
+    if isinstance(value, (tuple, list)):
+        return type(value)(scaled(v, factor) for v in value)
+
+    if isinstance(value, int):
+        return max(1, round(value * factor))
+
+    return value * factor
+
+
+def measure(
+    year: int,
+    day: int,
+    steps: int = 5,
+    base: float = 1.0,
+    seed: int = 0,
+    repeat: int = 3,
+    max_seconds: float = 10.0,
+    options: Optional[dict[str, Any]] = None,
+    scale: str = "size",
+) -> list[tuple[int, int, dict[str, float]]]:
+    """Time a day's solution on generated inputs of doubling size.
+
+    Parameters
+    ----------
+    year : int
+    day : int
+    steps : int
+        Number of sizes, starting from 1x.
+    base : float
+        Size of the 1x input, as a multiple of the generator's SIZE.
+    seed : int
+    repeat : int
+        Number of timed runs at each size.
+    max_seconds : float
+        Stop doubling once a single run takes longer than this.
+    options : Optional[dict[str, Any]]
+        Keyword arguments for the day's generate().
+    scale : str
+        What to double at each step: "size", or the name of a numeric option of the
+        day's generate(). An option's 1x value is taken from 'options', or else from
+        the default of generate().
+
+    Returns
+    -------
+    list[tuple[int, int, dict[str, float]]]
+        Scale, input bytes, and median seconds of each phase, for each size.
+
+    Raises
+    ------
+    ValueError
+        If 'scale' is not an option of the day's generate().
+    """
+    module = load(year, day)
+    generator = load(year, day, "generate")
+    options = dict(options or {})
+    size = max(1, round(generator.SIZE * base))
+    results = []
+
+    if scale != "size":
+        parameter = inspect.signature(generator.generate).parameters.get(scale)
+
+        if parameter is None or scale in ("seed", "size"):
+            raise ValueError(f"generate() has no option {scale!r}")
+
+        start = options.get(scale, parameter.default)
+
+    for step in range(steps):
+        factor = 2**step
+
+        if scale == "size":
+            buffer = generator.generate(size * factor, seed, **options)
+        else:
+            options[scale] = scaled(start, factor)
+            buffer = generator.generate(size, seed, **options)
+
+        samples = time_phases(module, buffer, repeat=repeat, warmup=int(step == 0))
+        medians = {phase: statistics.median(samples[phase]) for phase in PHASES}
+        results.append((factor, len(buffer), medians))
+
+        if sum(medians.values()) > max_seconds:
+            break
+
+    return results
+
+
+def _declared(year: int, day: int) -> tuple[str, ...]:
+    # Options which the day's generator asks to have scaled, besides the size.
+    try:
+        return tuple(getattr(load(year, day, "generate"), "SCALE", ()))
+    except FileNotFoundError:
+        return ()  # Reported as skipped when measuring the size.
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.scaling")
+    parser.add_argument("year", type=int)
+    parser.add_argument(
+        "days",
+        type=int,
+        nargs="*",
+        help="days to measure (default: all days with a solution)",
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=5,
+        help="number of sizes, each twice the previous (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--base",
+        type=float,
+        default=1.0,
+        help="size of the smallest input, relative to a typical puzzle input "
+        "(default: %(default)s)",
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of timed runs per size (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=10.0,
+        help="stop doubling a day's input once a run takes longer than this "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--option",
+        type=_option,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="keyword argument for each day's generate()",
+    )
+    parser.add_argument(
+        "--scale",
+        metavar="OPTION",
+        help="option of generate() to double instead of the size (default: the "
+        "size, then each option in the generator's SCALE)",
+    )
+    args = parser.parse_args(argv)
+
+    for day in args.days or days(args.year):
+        scales = [args.scale] if args.scale else ["size", *_declared(args.year, day)]
+
+        for scale in scales:
+            try:
+                results = measure(
+                    args.year,
+                    day,
+                    steps=args.steps,
+                    base=args.base,
+                    seed=args.seed,
+                    repeat=args.repeat,
+                    max_seconds=args.max_seconds,
+                    options=dict(args.option),
+                    scale=scale,
+                )
+            except (FileNotFoundError, ValueError, TypeError) as e:
+                # TypeError is raised by generators which lack an option given with -o.
+                print(f"{args.year} day {day}: skipped, {e}", file=sys.stderr)
+                continue
+
+            _report(day, scale, results)
+
+    return 0
+
+
+def _report(
+    day: int, scale: str, results: list[tuple[int, int, dict[str, float]]]
+) -> None:
+    print(f"day {day}" + (f", scaling {scale}" if scale != "size" else ""))
+    print(f"{'scale':>6} {'bytes':>12}" + "".join(f" {p:>12}" for p in PHASES))
+
+    for factor, size, medians in results:
+        print(
+            f"{factor:>5}x {size:>12}"
+            + "".join(f" {_format_seconds(medians[p]):>12}" for p in PHASES)
+        )
+
+    if len(results) > 1:
+        # Scaling an option need not change the size of the input, so the fit is
+        # against the option's value.
+        sizes = [factor if scale != "size" else size for factor, size, _ in results]
+        exponents = [
+            fit_exponent(sizes, [medians[p] for _, _, medians in results])
+            for p in PHASES
+        ]
+        print(f"{'exponent':>19}" + "".join(f" {k:>12.2f}" for k in exponents))
+
+    print()
+
+
+if __name__ == "__main__":
+    sys.exit(main())